@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""Benchmark skill discovery, parsing, install and load on synthetic trees.
+
+For each requested size a corpus is generated with ``gen_skill_corpus.py``
+and the following are timed over several rounds:
+
+    discovery_cold   build the metadata index from scratch
+    discovery_warm   rebuild it with nothing changed (one stat per skill)
+    parse            parse every SKILL.md frontmatter from memory
+    install_cold     hash the source and sync it into an empty target
+    install_noop     sync again with nothing changed
+    load             open a sample of skills and read one reference each
+    bundle_load      the same sample read from a packed bundle
+
+Results are written as JSON in the layout pytest-benchmark uses
+(``benchmarks[].stats`` with min/max/mean/median/stddev), so existing
+tooling can read them. ``--compare`` fails if a benchmark's median regressed
+beyond ``--threshold`` against a previous results file.
+
+Usage:
+    python scripts/bench_skills.py [--counts 10,1000,10000] [--rounds N]
+        [--output results.json] [--compare baseline.json] [--drop-caches]
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+from gen_skill_corpus import generate
+from install_skills import scan_source, sync_target
+from skill_bundle import SkillBundle, drop_page_cache, pack
+from skill_index import INDEX_FILENAME, SKILL_FILE, build_index, iter_skill_dirs, parse_frontmatter, write_index
+from skill_loader import SkillLoader
+
+LOAD_SAMPLE = 100
+
+
+def measure(
+    fn: Callable[[], object],
+    rounds: int,
+    setup: Callable[[], object] | None = None,
+    cold: bool = False,
+) -> dict:
+    """Run ``fn`` ``rounds`` times, calling ``setup`` untimed before each run."""
+    times = []
+    for _ in range(rounds):
+        if setup:
+            setup()
+        if cold:
+            drop_page_cache()
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    mean = statistics.fmean(times)
+    return {
+        "rounds": rounds,
+        "min": min(times),
+        "max": max(times),
+        "mean": mean,
+        "median": statistics.median(times),
+        "stddev": statistics.stdev(times) if len(times) > 1 else 0.0,
+        "ops": 1 / mean if mean else None,
+    }
+
+
+def run_suite(root: Path, work: Path, rounds: int, cold: bool) -> dict[str, dict]:
+    """Time every benchmark against the skills tree at ``root``."""
+    index_path = work / INDEX_FILENAME
+    skill_dirs = list(iter_skill_dirs(root))
+    sample = random.Random(0).sample(skill_dirs, min(LOAD_SAMPLE, len(skill_dirs)))
+    texts = [(d / SKILL_FILE).read_text(encoding="utf-8") for d in skill_dirs]
+    target = work / "target"
+    bundle_path = work / "skills.bundle"
+    results = {}
+
+    def remove_index() -> None:
+        index_path.unlink(missing_ok=True)
+
+    def discover() -> None:
+        index, _ = build_index(root, index_path)
+        write_index(index, index_path)
+
+    results["discovery_cold"] = measure(discover, rounds, setup=remove_index, cold=cold)
+    discover()
+    results["discovery_warm"] = measure(discover, rounds)
+    results["parse"] = measure(lambda: [parse_frontmatter(t) for t in texts], rounds)
+
+    def fresh_target() -> None:
+        shutil.rmtree(target, ignore_errors=True)
+        target.mkdir()
+
+    def install() -> None:
+        sync_target(scan_source(root), target, mode="copy")
+
+    results["install_cold"] = measure(install, rounds, setup=fresh_target, cold=cold)
+    results["install_noop"] = measure(install, rounds)
+    shutil.rmtree(target, ignore_errors=True)
+
+    def load() -> None:
+        for skill_dir in sample:
+            with SkillLoader(skill_dir) as loader:
+                for rel in loader.resources():
+                    loader.read(rel)
+                    break
+
+    def bundle_load() -> None:
+        with SkillBundle(bundle_path) as bundle:
+            for skill_dir in sample:
+                files = bundle.files(skill_dir.name)
+                bundle.read(skill_dir.name)
+                for rel in files:
+                    if rel != SKILL_FILE:
+                        bundle.read(skill_dir.name, rel)
+                        break
+
+    results["load"] = measure(load, rounds, cold=cold)
+    pack(root, bundle_path)
+    results["bundle_load"] = measure(bundle_load, rounds, cold=cold)
+    return results
+
+
+def compare(results: dict, baseline_path: Path, threshold: float) -> list[str]:
+    """Return descriptions of benchmarks whose median regressed past ``threshold``."""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {(b["group"], b["name"]): b["stats"]["median"] for b in json.load(f)["benchmarks"]}
+    regressions = []
+    for bench in results["benchmarks"]:
+        old = baseline.get((bench["group"], bench["name"]))
+        new = bench["stats"]["median"]
+        if old and new > old * (1 + threshold):
+            regressions.append(f"{bench['group']}/{bench['name']}: {old * 1000:.3f} ms -> {new * 1000:.3f} ms")
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--counts", default="10,1000", help="comma-separated corpus sizes (1 to 50000)")
+    parser.add_argument("--root", type=Path, help="benchmark an existing skills tree instead of generating one")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--description-words", type=int, default=30)
+    parser.add_argument("--references", type=int, default=1)
+    parser.add_argument("--reference-bytes", type=int, default=4096)
+    parser.add_argument("--drop-caches", action="store_true", help="drop the page cache before cold runs (root only)")
+    parser.add_argument("--output", "-o", type=Path, help="write JSON results here (default: stdout)")
+    parser.add_argument("--compare", type=Path, metavar="BASELINE", help="previous results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed median slowdown (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    counts = [int(c) for c in args.counts.split(",") if c]
+    if args.root is None and any(c < 1 or c > 50_000 for c in counts):
+        parser.error("--counts must be between 1 and 50000")
+    cold = args.drop_caches and drop_page_cache()
+    if args.drop_caches and not cold:
+        print("cannot drop page cache (not root?); cold runs use a warm cache", file=sys.stderr)
+
+    benchmarks = []
+    with tempfile.TemporaryDirectory(prefix="skill-bench-") as tmp:
+        work = Path(tmp)
+        if args.root:
+            trees = [(f"root:{args.root}", args.root, {})]
+        else:
+            trees = [
+                (
+                    f"count={count}",
+                    work / f"corpus-{count}",
+                    {
+                        "count": count,
+                        "description_words": args.description_words,
+                        "references": args.references,
+                        "reference_bytes": args.reference_bytes,
+                    },
+                )
+                for count in counts
+            ]
+
+        for group, root, params in trees:
+            if params:
+                generate(root, params["count"], args.description_words, args.references, args.reference_bytes)
+            print(f"benchmarking {group}", file=sys.stderr)
+            scratch = work / "scratch"
+            scratch.mkdir()
+            for name, stats in run_suite(root, scratch, args.rounds, cold).items():
+                benchmarks.append({"group": group, "name": name, "params": params, "stats": stats})
+                print(f"  {name:<16} median {stats['median'] * 1000:10.3f} ms", file=sys.stderr)
+            shutil.rmtree(scratch)
+            if params:
+                shutil.rmtree(root)
+
+    results = {
+        "machine_info": {
+            "python_version": platform.python_version(),
+            "system": platform.system(),
+            "release": platform.release(),
+            "machine": platform.machine(),
+            "cpu_count": os.cpu_count(),
+        },
+        "datetime": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "page_cache": "dropped" if cold else "warm",
+        "benchmarks": benchmarks,
+    }
+    text = json.dumps(results, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.threshold)
+        for regression in regressions:
+            print(f"regression: {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
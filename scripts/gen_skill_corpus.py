@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Generate a synthetic skills tree for benchmarking.
+
+Writes COUNT skills laid out as ``{skill-name}/SKILL.md`` with valid
+frontmatter, plus optional ``references/`` files of a given size. Output is
+deterministic for a given seed.
+
+Usage:
+    python scripts/gen_skill_corpus.py DEST --count N [--description-words N]
+        [--references N] [--reference-bytes N] [--seed N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+from pathlib import Path
+
+WORDS = (
+    "api audit build cache check cli code commit config deploy diff doc docker error "
+    "file format git graph index install lint load log merge migrate model parse patch "
+    "perf plan pr query refactor release review roast schema script search security "
+    "spec sql sync test token trace type upgrade validate yaml"
+).split()
+
+
+def generate(
+    dest: Path,
+    count: int,
+    description_words: int = 30,
+    references: int = 1,
+    reference_bytes: int = 4096,
+    seed: int = 0,
+) -> list[str]:
+    """Create ``count`` skills under ``dest`` and return their names."""
+    rng = random.Random(seed)
+    width = len(str(max(count - 1, 0)))
+    names = []
+    for i in range(count):
+        name = f"skill-{i:0{width}d}-{rng.choice(WORDS)}"
+        skill_dir = dest / name
+        skill_dir.mkdir(parents=True, exist_ok=True)
+        description = "Use when " + " ".join(rng.choices(WORDS, k=max(description_words - 2, 1)))
+        body = "\n".join(f"- {' '.join(rng.choices(WORDS, k=8))}" for _ in range(10))
+        (skill_dir / "SKILL.md").write_text(
+            f"---\nname: {name}\ndescription: {description}\n---\n\n# {name}\n\n{body}\n",
+            encoding="utf-8",
+        )
+        if references and reference_bytes:
+            ref_dir = skill_dir / "references"
+            ref_dir.mkdir(exist_ok=True)
+            for r in range(references):
+                line = " ".join(rng.choices(WORDS, k=12)) + "\n"
+                text = (line * (reference_bytes // len(line) + 1))[:reference_bytes]
+                (ref_dir / f"ref-{r}.md").write_text(text, encoding="utf-8")
+        names.append(name)
+    return names
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("dest", type=Path)
+    parser.add_argument("--count", "-n", type=int, required=True)
+    parser.add_argument("--description-words", type=int, default=30)
+    parser.add_argument("--references", type=int, default=1, help="reference files per skill")
+    parser.add_argument("--reference-bytes", type=int, default=4096, help="size of each reference file")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if args.dest.exists() and any(args.dest.iterdir()):
+        parser.error(f"{args.dest} is not empty")
+    names = generate(
+        args.dest, args.count, args.description_words, args.references, args.reference_bytes, args.seed
+    )
+    print(f"generated {len(names)} skills in {args.dest}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""Install or update skills into one or more skills directories.
+
+Replaces ``cp -r .claude/skills/* TARGET``. Source files are hashed once and
+only files whose content differs from the target are written. Each target
+keeps a ``.skill-sync.json`` manifest of what was installed, so unchanged
+files are recognised from a single ``stat`` and skills removed from the
+source are pruned without touching skills installed by other means.
+
+Usage:
+    python scripts/install_skills.py TARGET [TARGET ...] [--source DIR]
+        [--mode auto|copy|reflink|hardlink] [--no-prune] [--dry-run]
+"""
+
+from __future__ import annotations
+
+import argparse
+import errno
+import json
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from skill_index import hash_bytes, iter_skill_dirs
+
+MANIFEST_FILENAME = ".skill-sync.json"
+MANIFEST_VERSION = 1
+
+# Linux FICLONE ioctl: share extents with the source on btrfs, XFS, etc.
+FICLONE = 0x40049409
+
+
+@dataclass
+class SourceFile:
+    rel: str
+    path: str
+    size: int
+    sha256: str
+
+
+@dataclass
+class SyncReport:
+    target: str
+    files_written: int = 0
+    files_unchanged: int = 0
+    files_removed: int = 0
+    skills_pruned: list[str] = field(default_factory=list)
+    bytes_written: int = 0
+    seconds: float = 0.0
+    error: str | None = None
+
+
+def scan_source(source: Path) -> dict[str, list[SourceFile]]:
+    """Hash every file of every skill under ``source``."""
+    skills: dict[str, list[SourceFile]] = {}
+    for skill_dir in iter_skill_dirs(source):
+        files = []
+        for dirpath, dirnames, filenames in os.walk(skill_dir):
+            dirnames[:] = sorted(d for d in dirnames if d != "__pycache__")
+            for name in sorted(filenames):
+                path = os.path.join(dirpath, name)
+                with open(path, "rb") as f:
+                    data = f.read()
+                rel = os.path.relpath(path, skill_dir)
+                files.append(SourceFile(rel, path, len(data), hash_bytes(data)))
+        skills[skill_dir.name] = files
+    return skills
+
+
+def _is_plain_name(name: str) -> bool:
+    return name not in ("", ".", "..") and "/" not in name and os.sep not in name
+
+
+def _is_relative_path(rel: str) -> bool:
+    return not os.path.isabs(rel) and all(_is_plain_name(part) for part in rel.replace(os.sep, "/").split("/"))
+
+
+def load_manifest(target: Path) -> dict:
+    """Load the target's manifest, dropping entries that would point outside it."""
+    try:
+        with open(target / MANIFEST_FILENAME, encoding="utf-8") as f:
+            data = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {"version": MANIFEST_VERSION, "skills": {}}
+    if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+        return {"version": MANIFEST_VERSION, "skills": {}}
+    # Pruning deletes what the manifest names, so never trust a path in it.
+    skills = {}
+    for name, files in (data.get("skills") or {}).items():
+        if _is_plain_name(name) and isinstance(files, dict):
+            skills[name] = {
+                rel: entry for rel, entry in files.items() if _is_relative_path(rel) and isinstance(entry, dict)
+            }
+    return {"version": MANIFEST_VERSION, "skills": skills}
+
+
+def _reflink(src: str, dst: str) -> bool:
+    try:
+        import fcntl
+    except ImportError:
+        return False
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        try:
+            fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+        except OSError:
+            return False
+    return True
+
+
+def place_file(src: str, dst: str, mode: str) -> int:
+    """Write ``src`` to ``dst`` atomically; return the bytes physically written."""
+    tmp = dst + ".skill-sync.tmp"
+    if os.path.lexists(tmp):
+        os.unlink(tmp)
+    if mode == "hardlink":
+        try:
+            os.link(src, tmp)
+            os.replace(tmp, dst)
+            return 0
+        except OSError as exc:
+            if exc.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK):
+                raise
+    if mode in ("auto", "reflink") and _reflink(src, tmp):
+        shutil.copystat(src, tmp)
+        os.replace(tmp, dst)
+        return 0
+    shutil.copy2(src, tmp)
+    os.replace(tmp, dst)
+    return os.path.getsize(dst)
+
+
+def is_current(dst: str, src: SourceFile, recorded: dict | None) -> bool:
+    """Return True if ``dst`` already holds the content of ``src``."""
+    try:
+        st = os.stat(dst)
+    except FileNotFoundError:
+        return False
+    if st.st_size != src.size:
+        return False
+    if recorded and recorded.get("sha256") == src.sha256 and recorded.get("mtime_ns") == st.st_mtime_ns:
+        return True
+    with open(dst, "rb") as f:
+        return hash_bytes(f.read()) == src.sha256
+
+
+def _remove_file(skill_dir: Path, rel: str) -> None:
+    """Delete ``rel`` from ``skill_dir`` along with directories it leaves empty."""
+    path = skill_dir / rel
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+    for parent in path.parents:
+        if parent == skill_dir:
+            break
+        try:
+            os.rmdir(parent)
+        except OSError:
+            break
+
+
+def sync_target(
+    source: dict[str, list[SourceFile]],
+    target: Path,
+    mode: str = "auto",
+    prune: bool = True,
+    dry_run: bool = False,
+) -> SyncReport:
+    """Bring ``target`` in line with the scanned ``source`` skills."""
+    report = SyncReport(str(target))
+    start = time.perf_counter()
+    manifest = load_manifest(target)
+    old_skills = manifest["skills"]
+    new_skills: dict[str, dict] = {}
+
+    for skill, files in source.items():
+        skill_dir = target / skill
+        recorded_files = old_skills.get(skill, {})
+        entries = {}
+        for src in files:
+            dst = str(skill_dir / src.rel)
+            if is_current(dst, src, recorded_files.get(src.rel)):
+                report.files_unchanged += 1
+            else:
+                report.files_written += 1
+                if not dry_run:
+                    os.makedirs(os.path.dirname(dst), exist_ok=True)
+                    report.bytes_written += place_file(src.path, dst, mode)
+            if not dry_run:
+                entries[src.rel] = {"sha256": src.sha256, "mtime_ns": os.stat(dst).st_mtime_ns}
+
+        # Drop files we installed previously that the source no longer has.
+        for rel in recorded_files.keys() - {src.rel for src in files}:
+            report.files_removed += 1
+            if not dry_run:
+                _remove_file(skill_dir, rel)
+        new_skills[skill] = entries
+
+    for skill in old_skills.keys() - source.keys():
+        if not prune:
+            new_skills[skill] = old_skills[skill]
+            continue
+        report.skills_pruned.append(skill)
+        if not dry_run:
+            shutil.rmtree(target / skill, ignore_errors=True)
+
+    if not dry_run:
+        tmp = target / (MANIFEST_FILENAME + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": MANIFEST_VERSION, "skills": new_skills}, f, separators=(",", ":"))
+        os.replace(tmp, target / MANIFEST_FILENAME)
+
+    report.seconds = time.perf_counter() - start
+    return report
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("targets", nargs="+", type=Path)
+    parser.add_argument("--source", type=Path, default=Path(".claude/skills"))
+    parser.add_argument(
+        "--mode",
+        choices=["auto", "copy", "reflink", "hardlink"],
+        default="auto",
+        help="auto tries a reflink and falls back to copying; hardlinked files share edits with the source",
+    )
+    parser.add_argument("--no-prune", dest="prune", action="store_false", help="keep skills removed from the source")
+    parser.add_argument("--dry-run", "-n", action="store_true")
+    parser.add_argument("--jobs", "-j", type=int, default=8, help="targets synced concurrently")
+    parser.add_argument("--json", action="store_true", help="print reports as NDJSON")
+    args = parser.parse_args(argv)
+
+    if not args.source.is_dir():
+        parser.error(f"{args.source} is not a directory")
+
+    # Aliases of one directory would race on its manifest; sync each once.
+    unique: dict[Path, Path] = {}
+    for target in args.targets:
+        unique.setdefault(target.resolve(), target)
+    targets = list(unique.values())
+    start = time.perf_counter()
+    source = scan_source(args.source)
+
+    def run(target: Path) -> SyncReport:
+        try:
+            if not args.dry_run:
+                target.mkdir(parents=True, exist_ok=True)
+            return sync_target(source, target, args.mode, args.prune, args.dry_run)
+        except OSError as exc:
+            return SyncReport(str(target), error=str(exc))
+
+    failed = 0
+    total_bytes = 0
+    with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+        for report in pool.map(run, targets):
+            failed += report.error is not None
+            total_bytes += report.bytes_written
+            if args.json:
+                print(json.dumps(report.__dict__))
+            elif report.error:
+                print(f"{report.target}: error: {report.error}", file=sys.stderr)
+            else:
+                pruned = f", pruned {', '.join(report.skills_pruned)}" if report.skills_pruned else ""
+                print(
+                    f"{report.target}: {report.files_written} written, {report.files_unchanged} unchanged, "
+                    f"{report.files_removed} removed{pruned}; "
+                    f"{report.bytes_written} bytes in {report.seconds * 1000:.1f} ms"
+                )
+
+    elapsed = time.perf_counter() - start
+    print(
+        f"{len(source)} skills to {len(targets)} targets: {total_bytes} bytes written in {elapsed:.2f} s",
+        file=sys.stderr,
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
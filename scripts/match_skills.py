@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""Rank skills for a prompt by their trigger keywords.
+
+Builds a BM25 inverted index over each skill's name and description and
+persists it next to the skills. Term weights are precomputed at build time,
+so a query only sums the postings of its own terms.
+
+The index file is memory-mapped rather than decoded: a sorted term table is
+binary-searched for each query term and only that term's postings are
+unpacked, so opening the index costs a header read regardless of its size.
+Layout (little-endian)::
+
+    b"SKMATCH\0", u32 version, u32 n_skills, u32 n_terms
+    u64[n_skills + 1]  offsets into the skill blob
+    skill blob         "name\0path" records, UTF-8
+    u64[n_terms + 1]   offsets into the term blob
+    term blob          terms, UTF-8, sorted by bytes
+    u64[n_terms + 1]   offsets (in entries) into the postings
+    postings           (u32 skill, f32 weight) entries
+
+Usage:
+    python scripts/match_skills.py build [ROOT ...] [--index PATH]
+    python scripts/match_skills.py query PROMPT [-k N] [--index PATH]
+    python scripts/match_skills.py bench [--roots ROOT ... | --synthetic N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import heapq
+import json
+import math
+import mmap
+import os
+import random
+import re
+import struct
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+from skill_index import INDEX_FILENAME, build_index, write_index
+
+MATCH_FILENAME = ".skill-match.bin"
+MATCH_MAGIC = b"SKMATCH\0"
+MATCH_VERSION = 2
+HEADER = struct.Struct("<8sIII")
+OFFSET = struct.Struct("<Q")
+POSTING = struct.Struct("<If")
+
+# BM25 parameters; the name field counts NAME_BOOST times towards term frequency.
+K1 = 1.2
+B = 0.75
+NAME_BOOST = 3
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have how i in is it its of on or that the this to "
+    "use used uses using was when which with you your".split()
+)
+
+
+def tokenize(text: str) -> list[str]:
+    return [t for t in TOKEN_RE.findall(text.lower()) if t not in STOPWORDS]
+
+
+def build_matcher(docs: list[dict]) -> dict:
+    """Build a serialisable BM25 index from ``{name, description, path}`` dicts."""
+    doc_terms = []
+    for doc in docs:
+        tf = Counter(tokenize(doc["description"]))
+        for term in tokenize(doc["name"].replace("-", " ")):
+            tf[term] += NAME_BOOST
+        doc_terms.append(tf)
+
+    n = len(docs)
+    avg_len = sum(sum(tf.values()) for tf in doc_terms) / n if n else 0.0
+    df: Counter = Counter()
+    for tf in doc_terms:
+        df.update(tf.keys())
+
+    postings: dict[str, list[tuple[int, float]]] = {}
+    for doc_id, tf in enumerate(doc_terms):
+        norm = K1 * (1 - B + B * sum(tf.values()) / avg_len) if avg_len else K1
+        for term, freq in tf.items():
+            idf = math.log(1 + (n - df[term] + 0.5) / (df[term] + 0.5))
+            weight = idf * freq * (K1 + 1) / (freq + norm)
+            postings.setdefault(term, []).append((doc_id, weight))
+
+    return {
+        "skills": [{"name": d["name"], "path": d["path"]} for d in docs],
+        "postings": postings,
+    }
+
+
+def _pack_strings(strings: list[bytes]) -> bytes:
+    offsets = [0]
+    for item in strings:
+        offsets.append(offsets[-1] + len(item))
+    return b"".join(OFFSET.pack(o) for o in offsets) + b"".join(strings)
+
+
+def write_matcher(data: dict, index_path: Path) -> None:
+    """Atomically write the index from :func:`build_matcher` in the binary layout."""
+    skills = [f"{s['name']}\0{s['path']}".encode("utf-8") for s in data["skills"]]
+    terms = sorted((t.encode("utf-8"), t) for t in data["postings"])
+    offsets = [0]
+    entries = []
+    for _, term in terms:
+        for doc_id, weight in data["postings"][term]:
+            entries.append(POSTING.pack(doc_id, weight))
+        offsets.append(len(entries))
+
+    tmp = index_path.with_name(index_path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MATCH_MAGIC, MATCH_VERSION, len(skills), len(terms)))
+        f.write(_pack_strings(skills))
+        f.write(_pack_strings([encoded for encoded, _ in terms]))
+        f.write(b"".join(OFFSET.pack(o) for o in offsets))
+        f.write(b"".join(entries))
+    os.replace(tmp, index_path)
+
+
+class SkillMatcher:
+    """Query a persisted match index through a memory map.
+
+    Opening reads only the header and section offsets; each query term costs
+    a binary search over the term table plus a read of its own postings.
+    """
+
+    def __init__(self, index_path: Path):
+        self.index_path = Path(index_path)
+        self._map: mmap.mmap | None = None
+
+    def _open(self) -> mmap.mmap:
+        if self._map is not None:
+            return self._map
+        with open(self.index_path, "rb") as f:
+            m = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, n_skills, n_terms = HEADER.unpack_from(m)
+        except struct.error:
+            m.close()
+            raise ValueError(f"{self.index_path}: not a match index, rebuild it") from None
+        if magic != MATCH_MAGIC or version != MATCH_VERSION:
+            m.close()
+            raise ValueError(f"{self.index_path}: unsupported index version, rebuild it")
+        self.n_skills, self.n_terms = n_skills, n_terms
+        self._skill_offsets = HEADER.size
+        self._skill_blob = self._skill_offsets + OFFSET.size * (n_skills + 1)
+        self._term_offsets = self._skill_blob + self._offset(m, self._skill_offsets, n_skills)
+        self._term_blob = self._term_offsets + OFFSET.size * (n_terms + 1)
+        self._posting_offsets = self._term_blob + self._offset(m, self._term_offsets, n_terms)
+        self._postings = self._posting_offsets + OFFSET.size * (n_terms + 1)
+        self._map = m
+        return m
+
+    @staticmethod
+    def _offset(m: mmap.mmap, table: int, i: int) -> int:
+        return OFFSET.unpack_from(m, table + OFFSET.size * i)[0]
+
+    def _string(self, table: int, blob: int, i: int) -> bytes:
+        m = self._map
+        return m[blob + self._offset(m, table, i) : blob + self._offset(m, table, i + 1)]
+
+    def _find_term(self, term: bytes) -> int | None:
+        lo, hi = 0, self.n_terms
+        while lo < hi:
+            mid = (lo + hi) // 2
+            probe = self._string(self._term_offsets, self._term_blob, mid)
+            if probe < term:
+                lo = mid + 1
+            elif probe > term:
+                hi = mid
+            else:
+                return mid
+        return None
+
+    def postings(self, term: str):
+        """Yield ``(skill id, weight)`` pairs for ``term``."""
+        m = self._open()
+        i = self._find_term(term.encode("utf-8"))
+        if i is None:
+            return iter(())
+        start = self._postings + POSTING.size * self._offset(m, self._posting_offsets, i)
+        end = self._postings + POSTING.size * self._offset(m, self._posting_offsets, i + 1)
+        return POSTING.iter_unpack(m[start:end])
+
+    def skill(self, doc_id: int) -> tuple[str, str]:
+        """Return the ``(name, path)`` of skill ``doc_id``."""
+        self._open()
+        record = self._string(self._skill_offsets, self._skill_blob, doc_id).decode("utf-8")
+        name, _, path = record.partition("\0")
+        return name, path
+
+    def match(self, prompt: str, k: int = 5) -> list[tuple[str, float]]:
+        """Return up to ``k`` ``(skill name, score)`` pairs, best first."""
+        scores: dict[int, float] = {}
+        for term in set(tokenize(prompt)):
+            for doc_id, weight in self.postings(term):
+                scores[doc_id] = scores.get(doc_id, 0.0) + weight
+        best = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+        return [(self.skill(doc_id)[0], round(score, 4)) for doc_id, score in best]
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+
+def naive_match(docs: list[dict], prompt: str, k: int = 5) -> list[tuple[str, float]]:
+    """Baseline: tokenize and score every description on every query."""
+    terms = set(tokenize(prompt))
+    scored = []
+    for doc in docs:
+        words = tokenize(doc["name"].replace("-", " ") + " " + doc["description"])
+        score = sum(1 for w in words if w in terms)
+        if score:
+            scored.append((doc["name"], float(score)))
+    return heapq.nlargest(k, scored, key=lambda item: item[1])
+
+
+def collect_docs(roots: list[Path], persist: bool = True) -> list[dict]:
+    """Read skill metadata from each root via its incremental metadata index.
+
+    Missing roots are reported and skipped. With ``persist`` false the
+    metadata index is consulted but never written.
+    """
+    docs = []
+    for root in roots:
+        if not root.is_dir():
+            print(f"skip {root}: not a directory", file=sys.stderr)
+            continue
+        index, _ = build_index(root)
+        if persist:
+            write_index(index, root / INDEX_FILENAME)
+        for entry in index["skills"].values():
+            path = os.path.abspath(os.path.join(root, entry["path"]))
+            docs.append({"name": entry["name"], "description": entry["description"], "path": path})
+    return docs
+
+
+def synthetic_docs(count: int, seed: int = 0) -> list[dict]:
+    """Generate ``count`` skill descriptions from a fixed vocabulary."""
+    rng = random.Random(seed)
+    vocab = [f"w{i}" for i in range(5000)]
+    return [
+        {
+            "name": f"skill-{i}-{rng.choice(vocab)}",
+            "description": "Use when " + " ".join(rng.choices(vocab, k=rng.randint(10, 40))),
+            "path": f"skill-{i}/SKILL.md",
+        }
+        for i in range(count)
+    ]
+
+
+def bench(docs: list[dict], queries: int = 200, k: int = 5) -> dict:
+    """Time build, load and per-query latency against :func:`naive_match`."""
+    rng = random.Random(1)
+    vocab = sorted({t for d in docs for t in tokenize(d["description"])}) or ["empty"]
+    prompts = [" ".join(rng.choices(vocab, k=8)) for _ in range(queries)]
+
+    start = time.perf_counter()
+    data = build_matcher(docs)
+    build_s = time.perf_counter() - start
+
+    def per_query(fn) -> float:
+        start = time.perf_counter()
+        for prompt in prompts:
+            fn(prompt)
+        return (time.perf_counter() - start) / len(prompts)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        index_path = Path(tmp) / MATCH_FILENAME
+        write_matcher(data, index_path)
+        # What one CLI run pays: open the index and answer a single prompt.
+        start = time.perf_counter()
+        matcher = SkillMatcher(index_path)
+        matcher._open()
+        load_s = time.perf_counter() - start
+        matcher.match(prompts[0], k)
+        first_s = time.perf_counter() - start
+        indexed = per_query(lambda p: matcher.match(p, k))
+        matcher.close()
+
+    naive = per_query(lambda p: naive_match(docs, p, k))
+    return {
+        "skills": len(docs),
+        "queries": queries,
+        "build_ms": round(build_s * 1000, 3),
+        "load_ms": round(load_s * 1000, 3),
+        "first_query_ms": round(first_s * 1000, 3),
+        "indexed_query_us": round(indexed * 1e6, 1),
+        "naive_query_us": round(naive * 1e6, 1),
+        "speedup": round(naive / indexed, 1) if indexed else None,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_build = sub.add_parser("build", help="build the match index")
+    p_build.add_argument("roots", nargs="*", type=Path, default=[Path(".claude/skills")])
+    p_build.add_argument("--index", type=Path, help=f"output file (default: first root / {MATCH_FILENAME})")
+
+    p_query = sub.add_parser("query", help="rank skills for a prompt")
+    p_query.add_argument("prompt")
+    p_query.add_argument("-k", type=int, default=5)
+    p_query.add_argument("--index", type=Path, default=Path(".claude/skills") / MATCH_FILENAME)
+
+    p_bench = sub.add_parser("bench", help="compare indexed matching against a naive scan")
+    group = p_bench.add_mutually_exclusive_group()
+    group.add_argument("--roots", nargs="+", type=Path, default=[Path(".claude/skills")])
+    group.add_argument("--synthetic", type=int, metavar="N", help="benchmark N generated skills")
+    p_bench.add_argument("--queries", type=int, default=200)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        docs = collect_docs(args.roots)
+        index_path = args.index or args.roots[0] / MATCH_FILENAME
+        if not index_path.parent.is_dir():
+            parser.error(f"{index_path.parent} is not a directory; pass --index")
+        write_matcher(build_matcher(docs), index_path)
+        print(f"indexed {len(docs)} skills into {index_path}", file=sys.stderr)
+    elif args.command == "query":
+        if not args.index.is_file():
+            parser.error(f"{args.index} not found; run 'build' first")
+        try:
+            results = SkillMatcher(args.index).match(args.prompt, args.k)
+        except ValueError as exc:
+            parser.error(str(exc))
+        for name, score in results:
+            print(f"{score:.4f}\t{name}")
+    else:
+        docs = synthetic_docs(args.synthetic) if args.synthetic else collect_docs(args.roots, persist=False)
+        print(json.dumps(bench(docs, args.queries)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,421 @@
+#!/usr/bin/env python3
+"""Chunked, cached review stage for roast-review.
+
+Splits a unified diff into hunks, reuses cached findings for hunks whose
+content has been reviewed before, packs the rest into size-bounded chunks and
+sends them to the review model concurrently with retry and backoff.
+
+The model is reached over a small JSON-over-HTTP protocol so the stage can be
+run against any adapter, including the bundled stub server::
+
+    POST {"model": str, "prompt": str, "hunks": [{"id", "file", "diff"}]}
+    200  {"findings": [{"hunk": id, "line": int, "severity": str, "message": str,
+                        "rule": str (optional), "snippet": str (optional)}]}
+
+In responses, ``line`` is the 0-based index of the flagged line within the
+hunk body (the lines after the ``@@`` header). That keeps cached findings
+valid when the hunk moves. Emitted findings carry the absolute line in the
+new file instead.
+
+Usage:
+    git diff main | python scripts/roast_chunks.py review --endpoint URL
+    python scripts/roast_chunks.py stub-server [--port N] [--fail-rate R]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import random
+import re
+import sys
+import time
+import urllib.error
+import urllib.request
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+DEFAULT_CACHE_DIR = Path(".roast-cache")
+DEFAULT_PROMPT = "Roast this diff. Report concrete bugs, risks and smells per hunk."
+CACHE_VERSION = 1
+
+HUNK_RE = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,\d+)? @@")
+RETRY_STATUS = {408, 429, 500, 502, 503, 504}
+
+
+def in_new_file(line: str) -> bool:
+    """Whether a hunk body line occupies a line of the new file."""
+    return line[:1] not in ("-", "\\")
+
+
+@dataclass
+class Hunk:
+    file: str
+    header: str
+    lines: list[str]
+    start: int
+
+    @property
+    def text(self) -> str:
+        return "\n".join([self.header, *self.lines])
+
+    def new_line(self, index: int) -> int:
+        """Map a 0-based index into the hunk body to a line in the new file."""
+        before = self.lines[: max(index, 0)]
+        return self.start + sum(1 for line in before if in_new_file(line))
+
+    def emit(self, finding: dict) -> dict:
+        """Return ``finding`` with this hunk's file and an absolute line number."""
+        index = finding.get("line")
+        line = self.new_line(index) if isinstance(index, int) else None
+        return dict(finding, file=self.file, line=line)
+
+    def key(self, model: str, prompt: str) -> str:
+        """Content hash of the hunk, independent of its line numbers."""
+        h = hashlib.sha256()
+        for part in (str(CACHE_VERSION), model, prompt, self.file, *self.lines):
+            h.update(part.encode("utf-8", errors="surrogateescape"))
+            h.update(b"\0")
+        return h.hexdigest()
+
+
+@dataclass
+class Stats:
+    hunks: int = 0
+    cached: int = 0
+    chunks: int = 0
+    requests: int = 0
+    retries: int = 0
+    failed_chunks: int = 0
+    seconds: float = 0.0
+
+
+@dataclass
+class RetryPolicy:
+    attempts: int = 4
+    base_delay: float = 0.5
+    max_delay: float = 8.0
+    timeout: float = 120.0
+
+    def delay(self, attempt: int) -> float:
+        """Exponential backoff with full jitter for the given retry number."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+
+def parse_diff(text: str) -> list[Hunk]:
+    """Split a unified diff into hunks, tracking the file each belongs to."""
+    hunks: list[Hunk] = []
+    old_file = current_file = ""
+    hunk: Hunk | None = None
+    for line in text.splitlines():
+        if line.startswith("diff --git "):
+            hunk = None
+        elif line.startswith("+++ ") and hunk is None:
+            path = line[4:].split("\t")[0]
+            # Deleted files have no new side; name them by the old path.
+            current_file = old_file if path == "/dev/null" else path[2:] if path.startswith("b/") else path
+        elif line.startswith("--- ") and hunk is None:
+            path = line[4:].split("\t")[0]
+            old_file = path[2:] if path.startswith("a/") else path
+        elif m := HUNK_RE.match(line):
+            hunk = Hunk(current_file, line, [], int(m.group(1)))
+            hunks.append(hunk)
+        elif hunk is not None and line[:1] in (" ", "+", "-", "\\"):
+            hunk.lines.append(line)
+    return hunks
+
+
+def split_hunk(hunk: Hunk, max_bytes: int) -> list[Hunk]:
+    """Split a hunk that is larger than ``max_bytes`` by lines."""
+    if len(hunk.text.encode()) <= max_bytes:
+        return [hunk]
+    pieces: list[Hunk] = []
+    lines: list[str] = []
+    size = len(hunk.header) + 1
+    start = line_no = hunk.start
+    for line in hunk.lines:
+        line_size = len(line.encode()) + 1
+        if lines and size + line_size > max_bytes:
+            pieces.append(Hunk(hunk.file, f"{hunk.header} (part {len(pieces) + 1})", lines, start))
+            lines, size, start = [], len(hunk.header) + 1, line_no
+        lines.append(line)
+        size += line_size
+        if in_new_file(line):
+            line_no += 1
+    pieces.append(Hunk(hunk.file, f"{hunk.header} (part {len(pieces) + 1})", lines, start))
+    return pieces
+
+
+def make_chunks(hunks: list[tuple[str, Hunk]], max_bytes: int) -> list[list[tuple[str, Hunk]]]:
+    """Greedily pack ``(key, hunk)`` pairs into chunks of at most ``max_bytes``."""
+    chunks: list[list[tuple[str, Hunk]]] = []
+    current: list[tuple[str, Hunk]] = []
+    size = 0
+    for key, hunk in hunks:
+        hunk_size = len(hunk.text.encode())
+        if current and size + hunk_size > max_bytes:
+            chunks.append(current)
+            current, size = [], 0
+        current.append((key, hunk))
+        size += hunk_size
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+class JsonCache:
+    """JSON values stored as one file per content hash."""
+
+    def __init__(self, root: Path):
+        self.root = root
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Any:
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def put(self, key: str, value: Any) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(value, f)
+        os.replace(tmp, path)
+
+
+def post_json(url: str, payload: dict, timeout: float) -> dict:
+    req = urllib.request.Request(
+        url,
+        data=json.dumps(payload).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    with urllib.request.urlopen(req, timeout=timeout) as resp:
+        return json.load(resp)
+
+
+async def post_with_retry(
+    endpoint: str,
+    payload: dict,
+    semaphore: asyncio.Semaphore,
+    policy: RetryPolicy,
+    stats: Stats,
+) -> dict:
+    """POST ``payload``, retrying transient failures with backoff.
+
+    ``stats`` is any object with ``requests`` and ``retries`` counters.
+    """
+    for attempt in range(policy.attempts):
+        async with semaphore:
+            stats.requests += 1
+            try:
+                return await asyncio.to_thread(post_json, endpoint, payload, policy.timeout)
+            except urllib.error.HTTPError as exc:
+                if exc.code not in RETRY_STATUS or attempt == policy.attempts - 1:
+                    raise
+            except (urllib.error.URLError, TimeoutError, ConnectionError):
+                if attempt == policy.attempts - 1:
+                    raise
+        stats.retries += 1
+        await asyncio.sleep(policy.delay(attempt))
+    raise ValueError("RetryPolicy.attempts must be at least 1")
+
+
+async def review_chunk(
+    chunk: list[tuple[str, Hunk]],
+    endpoint: str,
+    model: str,
+    prompt: str,
+    semaphore: asyncio.Semaphore,
+    policy: RetryPolicy,
+    stats: Stats,
+) -> dict[str, list[dict]]:
+    """Send one chunk to the model and return raw findings grouped by hunk key.
+
+    Raises ``ValueError`` if the response is not a findings list for this
+    chunk, so a malformed reply is never cached as a clean review.
+    """
+    payload = {
+        "model": model,
+        "prompt": prompt,
+        "hunks": [{"id": key, "file": hunk.file, "diff": hunk.text} for key, hunk in chunk],
+    }
+    response = await post_with_retry(endpoint, payload, semaphore, policy, stats)
+
+    found = response.get("findings") if isinstance(response, dict) else None
+    if not isinstance(found, list):
+        raise ValueError("response has no findings list")
+    by_hunk: dict[str, list[dict]] = {key: [] for key, _ in chunk}
+    for finding in found:
+        if not isinstance(finding, dict) or finding.get("hunk") not in by_hunk:
+            raise ValueError(f"response has a finding for no hunk in the request: {finding!r:.200}")
+        by_hunk[finding["hunk"]].append(finding)
+    return by_hunk
+
+
+async def review_diff(
+    diff: str,
+    endpoint: str,
+    model: str = "gemini",
+    prompt: str = DEFAULT_PROMPT,
+    cache: JsonCache | None = None,
+    max_chunk_bytes: int = 32_000,
+    concurrency: int = 4,
+    policy: RetryPolicy | None = None,
+) -> tuple[list[dict], Stats]:
+    """Review ``diff`` and return all findings plus run statistics."""
+    policy = policy or RetryPolicy()
+    stats = Stats()
+    start = time.perf_counter()
+
+    # Identical hunks share a key: review one and apply its findings to all.
+    pending: dict[str, list[Hunk]] = {}
+    findings: list[dict] = []
+    for hunk in parse_diff(diff):
+        for piece in split_hunk(hunk, max_chunk_bytes):
+            stats.hunks += 1
+            key = piece.key(model, prompt)
+            cached = cache.get(key) if cache else None
+            if cached is None:
+                pending.setdefault(key, []).append(piece)
+            else:
+                stats.cached += 1
+                findings.extend(piece.emit(f) for f in cached)
+
+    chunks = make_chunks([(key, pieces[0]) for key, pieces in pending.items()], max_chunk_bytes)
+    stats.chunks = len(chunks)
+    semaphore = asyncio.Semaphore(concurrency)
+    results = await asyncio.gather(
+        *(review_chunk(c, endpoint, model, prompt, semaphore, policy, stats) for c in chunks),
+        return_exceptions=True,
+    )
+    for chunk, result in zip(chunks, results):
+        if isinstance(result, BaseException):
+            stats.failed_chunks += 1
+            print(f"chunk of {len(chunk)} hunks failed: {result}", file=sys.stderr)
+            continue
+        for key, _ in chunk:
+            hunk_findings = result[key]
+            if cache:
+                cache.put(key, hunk_findings)
+            for piece in pending[key]:
+                findings.extend(piece.emit(f) for f in hunk_findings)
+
+    stats.seconds = time.perf_counter() - start
+    return findings, stats
+
+
+def make_stub_server(port: int = 0, fail_rate: float = 0.0, latency: float = 0.0):
+    """Return an unstarted HTTP server acting as a fake model for local testing.
+
+    Review requests get a finding for every added TODO/FIXME line; validation
+    requests (see ``roast_validate.py``) get every non-``nit`` finding upheld.
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self) -> None:
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            time.sleep(latency)
+            if random.random() < fail_rate:
+                self.send_error(503)
+                return
+            if "findings" in body:
+                verdicts = [
+                    {"id": f["id"], "valid": f.get("severity") != "nit", "reason": "stub verdict"}
+                    for f in body["findings"]
+                ]
+                data = json.dumps({"verdicts": verdicts}).encode()
+            else:
+                found = []
+                for hunk in body["hunks"]:
+                    for offset, line in enumerate(hunk["diff"].splitlines()[1:]):
+                        if line.startswith("+") and ("TODO" in line or "FIXME" in line):
+                            found.append({
+                                "hunk": hunk["id"],
+                                "line": offset,
+                                "severity": "minor",
+                                "rule": "leftover-marker",
+                                "message": "leftover marker",
+                                "snippet": line[1:],
+                            })
+                data = json.dumps({"findings": found}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format: str, *args) -> None:
+            pass
+
+    return ThreadingHTTPServer(("127.0.0.1", port), Handler)
+
+
+def serve_stub(port: int, fail_rate: float, latency: float) -> None:
+    """Run the stub model from :func:`make_stub_server` until interrupted."""
+    server = make_stub_server(port, fail_rate, latency)
+    print(f"stub model listening on http://127.0.0.1:{server.server_port}/", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_review = sub.add_parser("review", help="review a diff read from a file or stdin")
+    p_review.add_argument("diff", nargs="?", type=Path, help="diff file (default: stdin)")
+    p_review.add_argument("--endpoint", required=True, help="review model URL")
+    p_review.add_argument("--model", default="gemini")
+    p_review.add_argument("--prompt", default=DEFAULT_PROMPT)
+    p_review.add_argument("--cache-dir", type=Path, default=DEFAULT_CACHE_DIR)
+    p_review.add_argument("--no-cache", action="store_true")
+    p_review.add_argument("--max-chunk-bytes", type=int, default=32_000)
+    p_review.add_argument("--concurrency", "-j", type=int, default=4)
+    p_review.add_argument("--attempts", type=int, default=4, help="tries per chunk")
+
+    p_stub = sub.add_parser("stub-server", help="run a local fake review model")
+    p_stub.add_argument("--port", type=int, default=8765)
+    p_stub.add_argument("--fail-rate", type=float, default=0.0, help="fraction of requests answered with 503")
+    p_stub.add_argument("--latency", type=float, default=0.05, help="seconds per request")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "stub-server":
+        serve_stub(args.port, args.fail_rate, args.latency)
+        return 0
+
+    diff = args.diff.read_text(encoding="utf-8", errors="surrogateescape") if args.diff else sys.stdin.read()
+    cache = None if args.no_cache else JsonCache(args.cache_dir)
+    findings, stats = asyncio.run(
+        review_diff(
+            diff,
+            args.endpoint,
+            model=args.model,
+            prompt=args.prompt,
+            cache=cache,
+            max_chunk_bytes=args.max_chunk_bytes,
+            concurrency=args.concurrency,
+            policy=RetryPolicy(attempts=args.attempts),
+        )
+    )
+    for finding in findings:
+        print(json.dumps(finding))
+    print(json.dumps(stats.__dict__), file=sys.stderr)
+    return 1 if stats.failed_chunks else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
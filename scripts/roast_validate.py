@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""Batched, deduplicating validation stage for roast-review.
+
+Reads review findings (NDJSON, as written by ``roast_chunks.py review``),
+clusters near-duplicates by fingerprint — the rule plus a normalised code
+snippet — and asks the validating model about one representative per
+cluster, several clusters per request. Each verdict is cached by fingerprint
+and applied to every finding in its cluster. Findings without a snippet are
+never merged with others.
+
+Validation requests use the same JSON-over-HTTP protocol as the review stage::
+
+    POST {"model": str, "prompt": str, "findings": [{"id", "rule", "file", "line", "message", "snippet"}]}
+    200  {"verdicts": [{"id": id, "valid": bool, "reason": str}]}
+
+Usage:
+    python scripts/roast_validate.py [FINDINGS] --endpoint URL [--batch-size N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import json
+import re
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from roast_chunks import DEFAULT_CACHE_DIR, JsonCache, RetryPolicy, post_with_retry
+from skill_index import estimate_tokens
+
+DEFAULT_PROMPT = "Validate each flagged issue against the code. Reject false positives."
+
+STRING_RE = re.compile(r"(\"(?:[^\"\\]|\\.)*\"|'(?:[^'\\]|\\.)*')")
+NUMBER_RE = re.compile(r"\b\d+(\.\d+)?\b")
+SPACE_RE = re.compile(r"\s+")
+
+
+@dataclass
+class Metrics:
+    findings: int = 0
+    clusters: int = 0
+    cached: int = 0
+    validated: int = 0
+    requests: int = 0
+    retries: int = 0
+    failed_batches: int = 0
+    tokens_sent: int = 0
+    # What validating every finding in its own request, uncached, would cost.
+    naive_requests: int = 0
+    naive_tokens: int = 0
+    seconds: float = 0.0
+
+    @property
+    def requests_saved(self) -> int:
+        return self.naive_requests - self.requests
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.naive_tokens - self.tokens_sent
+
+
+def normalize_snippet(snippet: str) -> str:
+    """Reduce a code snippet to a form shared by near-duplicate findings."""
+    lines = [line[1:] if line[:1] in "+- " else line for line in snippet.splitlines()]
+    text = STRING_RE.sub('"S"', "\n".join(lines))
+    text = NUMBER_RE.sub("N", text)
+    return SPACE_RE.sub(" ", text).strip()
+
+
+def fingerprint(finding: dict) -> str:
+    """Fingerprint of a finding: its rule (or message) and normalised snippet.
+
+    Findings without a snippet cannot be recognised as duplicates, so their
+    file, line and message are included to keep them in a cluster of one.
+    """
+    message = finding.get("message") or ""
+    rule = finding.get("rule") or NUMBER_RE.sub("N", message.lower()).strip()
+    snippet = normalize_snippet(finding.get("snippet") or "")
+    if snippet:
+        parts = [rule, snippet]
+    else:
+        parts = [rule, "", finding.get("file") or "", str(finding.get("line")), message]
+    return hashlib.sha256("\0".join(parts).encode("utf-8", errors="surrogateescape")).hexdigest()
+
+
+def cluster_findings(findings: list[dict]) -> dict[str, list[dict]]:
+    """Group findings by fingerprint, preserving first-seen order."""
+    clusters: dict[str, list[dict]] = {}
+    for finding in findings:
+        clusters.setdefault(fingerprint(finding), []).append(finding)
+    return clusters
+
+
+def _request_item(fp: str, finding: dict) -> dict:
+    return {
+        "id": fp,
+        "rule": finding.get("rule") or "",
+        "file": finding.get("file") or "",
+        "line": finding.get("line"),
+        "severity": finding.get("severity") or "",
+        "message": finding.get("message") or "",
+        "snippet": finding.get("snippet") or "",
+    }
+
+
+async def validate_findings(
+    findings: list[dict],
+    endpoint: str,
+    model: str = "claude",
+    prompt: str = DEFAULT_PROMPT,
+    cache: JsonCache | None = None,
+    batch_size: int = 20,
+    concurrency: int = 4,
+    policy: RetryPolicy | None = None,
+) -> tuple[list[dict], Metrics]:
+    """Attach a verdict to every finding and return them with run metrics.
+
+    Findings whose cluster could not be validated are returned with
+    ``valid`` set to ``None``.
+    """
+    policy = policy or RetryPolicy()
+    metrics = Metrics(findings=len(findings))
+    start = time.perf_counter()
+
+    clusters = cluster_findings(findings)
+    metrics.clusters = len(clusters)
+    prompt_tokens = estimate_tokens(len(prompt))
+    for finding in findings:
+        item = _request_item("", finding)
+        metrics.naive_requests += 1
+        metrics.naive_tokens += prompt_tokens + estimate_tokens(len(json.dumps(item)))
+
+    verdicts: dict[str, dict] = {}
+    pending: list[dict] = []
+    for fp, members in clusters.items():
+        key = hashlib.sha256(f"{model}\0{prompt}\0{fp}".encode()).hexdigest()
+        cached = cache.get(key) if cache else None
+        if cached is not None:
+            verdicts[fp] = cached
+            metrics.cached += 1
+        else:
+            pending.append(_request_item(fp, members[0]) | {"_key": key})
+
+    batches = [pending[i : i + batch_size] for i in range(0, len(pending), batch_size)]
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(batch: list[dict]) -> dict:
+        items = [{k: v for k, v in item.items() if k != "_key"} for item in batch]
+        payload = {"model": model, "prompt": prompt, "findings": items}
+        metrics.tokens_sent += prompt_tokens + estimate_tokens(len(json.dumps(items)))
+        return await post_with_retry(endpoint, payload, semaphore, policy, metrics)
+
+    results = await asyncio.gather(*(run(b) for b in batches), return_exceptions=True)
+    for batch, result in zip(batches, results):
+        if isinstance(result, BaseException):
+            metrics.failed_batches += 1
+            print(f"batch of {len(batch)} findings failed: {result}", file=sys.stderr)
+            continue
+        returned = result.get("verdicts") if isinstance(result, dict) else None
+        if not isinstance(returned, list):
+            metrics.failed_batches += 1
+            print(f"batch of {len(batch)} findings failed: response has no verdicts list", file=sys.stderr)
+            continue
+        keys = {item["id"]: item["_key"] for item in batch}
+        for verdict in returned:
+            fp = verdict.get("id") if isinstance(verdict, dict) else None
+            if fp not in keys:
+                continue
+            verdict = {"valid": bool(verdict.get("valid")), "reason": verdict.get("reason", "")}
+            verdicts[fp] = verdict
+            metrics.validated += 1
+            if cache:
+                cache.put(keys[fp], verdict)
+
+    out = []
+    for fp, members in clusters.items():
+        verdict = verdicts.get(fp, {"valid": None, "reason": "not validated"})
+        for finding in members:
+            out.append(dict(finding, cluster=fp[:12], cluster_size=len(members), **verdict))
+
+    metrics.seconds = time.perf_counter() - start
+    return out, metrics
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("findings", nargs="?", type=Path, help="findings NDJSON (default: stdin)")
+    parser.add_argument("--endpoint", required=True, help="validation model URL")
+    parser.add_argument("--model", default="claude")
+    parser.add_argument("--prompt", default=DEFAULT_PROMPT)
+    parser.add_argument("--cache-dir", type=Path, default=DEFAULT_CACHE_DIR / "verdicts")
+    parser.add_argument("--no-cache", action="store_true")
+    parser.add_argument("--batch-size", type=int, default=20, help="clusters per request")
+    parser.add_argument("--concurrency", "-j", type=int, default=4)
+    parser.add_argument("--attempts", type=int, default=4, help="tries per batch")
+    parser.add_argument("--valid-only", action="store_true", help="only print upheld findings")
+    args = parser.parse_args(argv)
+
+    text = args.findings.read_text(encoding="utf-8") if args.findings else sys.stdin.read()
+    findings = [json.loads(line) for line in text.splitlines() if line.strip()]
+    cache = None if args.no_cache else JsonCache(args.cache_dir)
+    results, metrics = asyncio.run(
+        validate_findings(
+            findings,
+            args.endpoint,
+            model=args.model,
+            prompt=args.prompt,
+            cache=cache,
+            batch_size=args.batch_size,
+            concurrency=args.concurrency,
+            policy=RetryPolicy(attempts=args.attempts),
+        )
+    )
+    for finding in results:
+        if args.valid_only and not finding["valid"]:
+            continue
+        print(json.dumps(finding))
+    report = dict(metrics.__dict__, requests_saved=metrics.requests_saved, tokens_saved=metrics.tokens_saved)
+    print(json.dumps(report), file=sys.stderr)
+    return 1 if metrics.failed_batches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""Pack skills into a single-file bundle that can be read without unpacking.
+
+Bundle layout::
+
+    b"SKILLBDL"          magic
+    u32 version          little-endian
+    u64 index_length     little-endian
+    index                UTF-8 JSON: per skill its frontmatter and, per file,
+                         [offset, size, sha256] relative to the data section
+    data                 file contents, stored uncompressed
+
+Readers map the file and parse only the index, so listing skills or reading
+one ``SKILL.md`` or reference touches only the pages involved.
+
+Usage:
+    python scripts/skill_bundle.py pack [ROOT] -o BUNDLE
+    python scripts/skill_bundle.py list BUNDLE
+    python scripts/skill_bundle.py cat BUNDLE SKILL [REL_PATH]
+    python scripts/skill_bundle.py unpack BUNDLE DEST [--no-verify]
+    python scripts/skill_bundle.py verify BUNDLE
+    python scripts/skill_bundle.py bench [ROOT] [--repeat N] [--drop-caches]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import mmap
+import os
+import shutil
+import struct
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from install_skills import scan_source
+from skill_index import SKILL_FILE, hash_bytes, iter_skill_dirs, parse_frontmatter
+
+MAGIC = b"SKILLBDL"
+BUNDLE_VERSION = 1
+HEADER = struct.Struct("<8sIQ")
+
+
+class BundleError(Exception):
+    pass
+
+
+def pack(root: Path, out: Path) -> dict:
+    """Write every skill under ``root`` to the bundle ``out``; return the index."""
+    source = scan_source(root)
+    skills: dict[str, dict] = {}
+    offset = 0
+    for name, files in source.items():
+        entries = {}
+        for f in files:
+            entries[f.rel.replace(os.sep, "/")] = [offset, f.size, f.sha256]
+            offset += f.size
+        with open(root / name / SKILL_FILE, encoding="utf-8", errors="replace") as fh:
+            meta = parse_frontmatter(fh.read())
+        skills[name] = {"name": meta.get("name", ""), "description": meta.get("description", ""), "files": entries}
+
+    index = json.dumps({"skills": skills}, separators=(",", ":")).encode("utf-8")
+    tmp = out.with_name(out.name + ".tmp")
+    with open(tmp, "wb") as dst:
+        dst.write(HEADER.pack(MAGIC, BUNDLE_VERSION, len(index)))
+        dst.write(index)
+        for files in source.values():
+            for f in files:
+                with open(f.path, "rb") as src:
+                    shutil.copyfileobj(src, dst)
+    os.replace(tmp, out)
+    return {"skills": skills}
+
+
+class SkillBundle:
+    """Read-only, memory-mapped view of a skill bundle."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            try:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # mmap refuses empty files.
+                raise BundleError(f"{self.path}: truncated header") from None
+        try:
+            self.index = self._read_index()
+        except BaseException:
+            self._map.close()
+            raise
+
+    def _read_index(self) -> dict:
+        if len(self._map) < HEADER.size:
+            raise BundleError(f"{self.path}: truncated header")
+        magic, version, index_len = HEADER.unpack_from(self._map)
+        if magic != MAGIC:
+            raise BundleError(f"{self.path}: not a skill bundle")
+        if version != BUNDLE_VERSION:
+            raise BundleError(f"{self.path}: unsupported bundle version {version}")
+        self._data_start = HEADER.size + index_len
+        if self._data_start > len(self._map):
+            raise BundleError(f"{self.path}: truncated index")
+        try:
+            index = json.loads(self._map[HEADER.size : self._data_start])
+        except (UnicodeDecodeError, json.JSONDecodeError) as exc:
+            raise BundleError(f"{self.path}: corrupt index: {exc}") from None
+        skills = index.get("skills") if isinstance(index, dict) else None
+        if not isinstance(skills, dict) or not all(isinstance(skill, dict) for skill in skills.values()):
+            raise BundleError(f"{self.path}: corrupt index")
+        return index
+
+    def __enter__(self) -> SkillBundle:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._map.close()
+
+    def skills(self) -> dict[str, dict]:
+        return self.index["skills"]
+
+    def files(self, skill: str) -> dict[str, list]:
+        try:
+            files = self.skills()[skill]["files"]
+        except KeyError:
+            raise BundleError(f"no skill {skill!r} in {self.path}") from None
+        if not isinstance(files, dict):
+            raise BundleError(f"{self.path}: corrupt file table for skill {skill!r}")
+        return files
+
+    def entry(self, skill: str, rel: str = SKILL_FILE) -> tuple[int, int, str]:
+        """Return the ``(offset, size, sha256)`` index entry of ``rel`` within ``skill``."""
+        try:
+            entry = self.files(skill)[rel]
+        except KeyError:
+            raise BundleError(f"no file {rel!r} in skill {skill!r}") from None
+        if (
+            not isinstance(entry, list)
+            or len(entry) != 3
+            or not all(isinstance(n, int) and n >= 0 for n in entry[:2])
+            or not isinstance(entry[2], str)
+        ):
+            raise BundleError(f"{self.path}: corrupt entry for {skill}/{rel}")
+        return entry[0], entry[1], entry[2]
+
+    def read(self, skill: str, rel: str = SKILL_FILE) -> bytes:
+        """Return the contents of ``rel`` within ``skill``."""
+        offset, size, _ = self.entry(skill, rel)
+        start = self._data_start + offset
+        if start + size > len(self._map):
+            raise BundleError(f"{self.path}: truncated data for {skill}/{rel}")
+        return self._map[start : start + size]
+
+    def verify(self) -> list[str]:
+        """Return a list of problems; empty if every file matches its hash."""
+        problems = []
+        for skill in self.skills():
+            try:
+                files = self.files(skill)
+            except BundleError as exc:
+                problems.append(f"{skill}: {exc}")
+                continue
+            for rel in files:
+                try:
+                    _, _, digest = self.entry(skill, rel)
+                    data = self.read(skill, rel)
+                except BundleError as exc:
+                    problems.append(f"{skill}/{rel}: bad entry: {exc}")
+                    continue
+                if hash_bytes(data) != digest:
+                    problems.append(f"{skill}/{rel}: hash mismatch")
+        return problems
+
+
+def unpack(bundle: SkillBundle, dest: Path, verify: bool = True) -> int:
+    """Extract every skill into ``dest``; return the number of files written.
+
+    Each file is checked against its hash before it is written unless
+    ``verify`` is false.
+    """
+    count = 0
+    dest = dest.resolve()
+    for skill in bundle.skills():
+        for rel in bundle.files(skill):
+            path = (dest / skill / rel).resolve()
+            if dest not in path.parents:
+                raise BundleError(f"refusing to write outside {dest}: {skill}/{rel}")
+            _, _, digest = bundle.entry(skill, rel)
+            data = bundle.read(skill, rel)
+            if verify and hash_bytes(data) != digest:
+                raise BundleError(f"{bundle.path}: hash mismatch for {skill}/{rel}")
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(data)
+            count += 1
+    return count
+
+
+def drop_page_cache() -> bool:
+    """Ask Linux to drop clean page cache (needs root); return True on success."""
+    try:
+        os.sync()
+        with open("/proc/sys/vm/drop_caches", "w") as f:
+            f.write("1\n")
+        return True
+    except OSError:
+        return False
+
+
+def bench(root: Path, repeat: int = 5, drop_caches: bool = False) -> dict:
+    """Time listing every skill (plus one SKILL.md read from the bundle) in both layouts."""
+
+    def loose() -> None:
+        # The loose layout has no index: listing means reading every SKILL.md.
+        for skill_dir in iter_skill_dirs(root):
+            with open(skill_dir / SKILL_FILE, encoding="utf-8", errors="replace") as f:
+                parse_frontmatter(f.read())
+
+    def bundled(path: Path) -> None:
+        with SkillBundle(path) as b:
+            names = list(b.skills())
+            if names:
+                b.read(names[-1])
+
+    def timed(fn) -> list[float]:
+        times = []
+        for _ in range(repeat):
+            if cold:
+                drop_page_cache()
+            start = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - start)
+        return times
+
+    cold = drop_caches and drop_page_cache()
+    with tempfile.TemporaryDirectory() as tmp:
+        bundle_path = Path(tmp) / "skills.bundle"
+        start = time.perf_counter()
+        index = pack(root, bundle_path)
+        pack_s = time.perf_counter() - start
+        loose_times = timed(loose)
+        bundle_times = timed(lambda: bundled(bundle_path))
+        bundle_size = bundle_path.stat().st_size
+
+    return {
+        "skills": len(index["skills"]),
+        "files": sum(len(s["files"]) for s in index["skills"].values()),
+        "bundle_bytes": bundle_size,
+        "page_cache": "dropped" if cold else "warm",
+        "pack_ms": round(pack_s * 1000, 3),
+        "loose_first_ms": round(loose_times[0] * 1000, 3),
+        "loose_best_ms": round(min(loose_times) * 1000, 3),
+        "bundle_first_ms": round(bundle_times[0] * 1000, 3),
+        "bundle_best_ms": round(min(bundle_times) * 1000, 3),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_pack = sub.add_parser("pack", help="pack a skills directory into a bundle")
+    p_pack.add_argument("root", nargs="?", type=Path, default=Path(".claude/skills"))
+    p_pack.add_argument("-o", "--output", type=Path, required=True)
+
+    p_list = sub.add_parser("list", help="list skills in a bundle")
+    p_list.add_argument("bundle", type=Path)
+
+    p_cat = sub.add_parser("cat", help="print a file from a bundled skill")
+    p_cat.add_argument("bundle", type=Path)
+    p_cat.add_argument("skill")
+    p_cat.add_argument("path", nargs="?", default=SKILL_FILE)
+
+    p_unpack = sub.add_parser("unpack", help="extract a bundle into a skills directory")
+    p_unpack.add_argument("bundle", type=Path)
+    p_unpack.add_argument("dest", type=Path)
+    p_unpack.add_argument("--no-verify", action="store_true", help="skip checking each file against its hash")
+
+    p_verify = sub.add_parser("verify", help="check every file against its hash")
+    p_verify.add_argument("bundle", type=Path)
+
+    p_bench = sub.add_parser("bench", help="compare load time against the loose layout")
+    p_bench.add_argument("root", nargs="?", type=Path, default=Path(".claude/skills"))
+    p_bench.add_argument("--repeat", type=int, default=5)
+    p_bench.add_argument("--drop-caches", action="store_true", help="drop the page cache before each run (root only)")
+
+    args = parser.parse_args(argv)
+
+    if args.command in ("pack", "bench") and not args.root.is_dir():
+        parser.error(f"{args.root} is not a directory")
+    if args.command == "pack":
+        index = pack(args.root, args.output)
+        print(f"packed {len(index['skills'])} skills into {args.output}", file=sys.stderr)
+        return 0
+    if args.command == "bench":
+        print(json.dumps(bench(args.root, args.repeat, args.drop_caches)))
+        return 0
+
+    try:
+        with SkillBundle(args.bundle) as bundle:
+            if args.command == "list":
+                for name, skill in bundle.skills().items():
+                    print(f"{name}\t{skill.get('description', '')}")
+            elif args.command == "cat":
+                sys.stdout.buffer.write(bundle.read(args.skill, args.path))
+            elif args.command == "unpack":
+                count = unpack(bundle, args.dest, verify=not args.no_verify)
+                print(f"unpacked {count} files into {args.dest}", file=sys.stderr)
+            else:
+                problems = bundle.verify()
+                for problem in problems:
+                    print(problem)
+                print(f"{args.bundle}: {'FAILED' if problems else 'OK'}", file=sys.stderr)
+                return 1 if problems else 0
+    except BundleError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        if args.command == "verify":
+            print(f"{args.bundle}: FAILED", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""Build and query a metadata index of installed skills.
+
+Walks a skills root laid out as ``{skill-name}/SKILL.md`` and writes a compact
+JSON index holding each skill's frontmatter, path, content hash and size.
+Rebuilds are incremental: a skill whose ``SKILL.md`` has the same mtime and
+size as the indexed entry is reused without being read, and one whose content
+hash is unchanged is reused without being re-parsed.
+
+Usage:
+    python scripts/skill_index.py [ROOT ...] [--index PATH] [--list]
+
+With no ROOT, indexes ``.claude/skills`` in the current directory.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import stat
+import sys
+from pathlib import Path
+from typing import Iterator
+
+INDEX_FILENAME = ".skill-index.json"
+INDEX_VERSION = 1
+SKILL_FILE = "SKILL.md"
+
+
+def parse_frontmatter(text: str) -> dict[str, str]:
+    """Parse the YAML frontmatter block at the top of a SKILL.md.
+
+    Only the subset used by skill definitions is supported: top-level
+    ``key: value`` pairs, quoted scalars, and ``>``/``|`` block scalars.
+    Returns an empty dict when the file has no frontmatter.
+    """
+    lines = text.removeprefix("\ufeff").splitlines()
+    if not lines or lines[0].strip() != "---":
+        return {}
+
+    meta: dict[str, str] = {}
+    key: str | None = None
+    style = ""
+    block: list[str] = []
+
+    def flush() -> None:
+        if key is None:
+            return
+        joiner = "\n" if style == "|" else " "
+        meta[key] = joiner.join(part for part in block if part or style == "|").strip()
+
+    for line in lines[1:]:
+        if line.strip() == "---":
+            flush()
+            return meta
+        if key is not None and (line.startswith((" ", "\t")) or not line.strip()):
+            block.append(line.strip())
+            continue
+        if ":" not in line or line.lstrip().startswith("#"):
+            continue
+        flush()
+        name, _, value = line.partition(":")
+        key, value = name.strip(), value.strip()
+        style = value if value in (">", "|", ">-", "|-") else ""
+        style = style[:1]
+        if style:
+            block = []
+        else:
+            if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+                value = value[1:-1]
+            block = [value]
+    # Unterminated frontmatter is not frontmatter.
+    return {}
+
+
+def iter_skill_files(root: Path) -> Iterator[tuple[Path, os.stat_result]]:
+    """Yield each skill directory under ``root`` with the ``stat`` of its SKILL.md.
+
+    Costs one ``stat`` per skill; the directory listing supplies the rest.
+    """
+    try:
+        entries = sorted(os.scandir(root), key=lambda e: e.name)
+    except FileNotFoundError:
+        return
+    for entry in entries:
+        if entry.is_dir() and not entry.name.startswith("."):
+            try:
+                st = os.stat(os.path.join(entry.path, SKILL_FILE))
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+            if stat.S_ISREG(st.st_mode):
+                yield Path(entry.path), st
+
+
+def iter_skill_dirs(root: Path) -> Iterator[Path]:
+    """Yield each immediate subdirectory of ``root`` that contains a SKILL.md."""
+    for skill_dir, _ in iter_skill_files(root):
+        yield skill_dir
+
+
+def hash_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def estimate_tokens(size: int) -> int:
+    """Rough token count for ``size`` characters or bytes of text (~4 per token)."""
+    return (size + 3) // 4
+
+
+def load_index(index_path: Path) -> dict:
+    """Load an index file, returning an empty index if missing or stale."""
+    try:
+        with open(index_path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {"version": INDEX_VERSION, "skills": {}}
+    if data.get("version") != INDEX_VERSION:
+        return {"version": INDEX_VERSION, "skills": {}}
+    return data
+
+
+def build_index(root: Path, index_path: Path | None = None) -> tuple[dict, dict[str, int]]:
+    """Incrementally rebuild the index for ``root``.
+
+    Returns the new index and counts of how each skill was handled
+    (``reused``, ``rehashed``, ``parsed``, ``removed``).
+    """
+    root = Path(root)
+    index_path = index_path or root / INDEX_FILENAME
+    previous = load_index(index_path)["skills"]
+    skills: dict[str, dict] = {}
+    stats = {"reused": 0, "rehashed": 0, "parsed": 0, "removed": 0}
+
+    for skill_dir, st in iter_skill_files(root):
+        skill_md = skill_dir / SKILL_FILE
+        key = skill_dir.name
+        old = previous.get(key)
+        if old and old["mtime_ns"] == st.st_mtime_ns and old["size"] == st.st_size:
+            skills[key] = old
+            stats["reused"] += 1
+            continue
+
+        data = skill_md.read_bytes()
+        digest = hash_bytes(data)
+        if old and old["sha256"] == digest:
+            entry = dict(old, mtime_ns=st.st_mtime_ns, size=st.st_size)
+            stats["rehashed"] += 1
+        else:
+            meta = parse_frontmatter(data.decode("utf-8", errors="replace"))
+            entry = {
+                "name": meta.get("name", ""),
+                "description": meta.get("description", ""),
+                "path": os.path.relpath(skill_md, root),
+                "sha256": digest,
+                "size": st.st_size,
+                "mtime_ns": st.st_mtime_ns,
+            }
+            stats["parsed"] += 1
+        skills[key] = entry
+
+    stats["removed"] = len(previous.keys() - skills.keys())
+    return {"version": INDEX_VERSION, "skills": skills}, stats
+
+
+def write_index(index: dict, index_path: Path) -> None:
+    """Atomically write ``index`` to ``index_path``."""
+    tmp = index_path.with_name(index_path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(index, f, separators=(",", ":"), sort_keys=True)
+    os.replace(tmp, index_path)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("roots", nargs="*", type=Path, default=[Path(".claude/skills")])
+    parser.add_argument("--index", type=Path, help="index file (single root only)")
+    parser.add_argument("--list", action="store_true", help="print indexed skills")
+    args = parser.parse_args(argv)
+
+    if args.index and len(args.roots) > 1:
+        parser.error("--index can only be used with a single root")
+
+    for root in args.roots:
+        if not root.is_dir():
+            print(f"skip {root}: not a directory", file=sys.stderr)
+            continue
+        index_path = args.index or root / INDEX_FILENAME
+        index, stats = build_index(root, index_path)
+        write_index(index, index_path)
+        summary = ", ".join(f"{k} {v}" for k, v in stats.items())
+        print(f"{root}: {len(index['skills'])} skills ({summary})", file=sys.stderr)
+        if args.list:
+            for entry in index["skills"].values():
+                print(f"{entry['name']}\t{entry['description']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
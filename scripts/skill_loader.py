@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""Lazy loading of skill resources, and a token-footprint profiler.
+
+``SkillLoader`` reads only ``SKILL.md`` up front. Files under ``references/``
+and ``scripts/`` are listed from a directory scan and served on demand
+through memory-mapped reads, so a slice of a large reference document costs
+only the pages it touches.
+
+Usage:
+    python scripts/skill_loader.py profile [ROOT] [--json]
+    python scripts/skill_loader.py read SKILL_DIR REL_PATH [--offset N] [--length N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import mmap
+import os
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+from skill_index import SKILL_FILE, estimate_tokens, iter_skill_dirs, parse_frontmatter
+
+RESOURCE_DIRS = ("references", "scripts")
+
+
+@dataclass
+class Resource:
+    path: str
+    size: int
+
+
+class SkillLoader:
+    """Load one skill: SKILL.md eagerly, resources only when asked."""
+
+    def __init__(self, skill_dir: Path):
+        self.skill_dir = Path(skill_dir).resolve()
+        self.skill_md = (self.skill_dir / SKILL_FILE).read_text(encoding="utf-8")
+        self.metadata = parse_frontmatter(self.skill_md)
+        self._resources: dict[str, Resource] | None = None
+        self._maps: dict[str, mmap.mmap] = {}
+
+    def __enter__(self) -> SkillLoader:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def resources(self) -> dict[str, Resource]:
+        """Return ``references/`` and ``scripts/`` files keyed by relative path."""
+        if self._resources is None:
+            found = {}
+            for top in RESOURCE_DIRS:
+                for dirpath, dirnames, filenames in os.walk(self.skill_dir / top):
+                    dirnames[:] = sorted(d for d in dirnames if d != "__pycache__")
+                    for name in sorted(filenames):
+                        path = os.path.join(dirpath, name)
+                        rel = os.path.relpath(path, self.skill_dir).replace(os.sep, "/")
+                        found[rel] = Resource(rel, os.path.getsize(path))
+            self._resources = found
+        return self._resources
+
+    def _map(self, rel: str) -> mmap.mmap | None:
+        if rel not in self.resources():
+            raise KeyError(f"{rel} is not a resource of {self.skill_dir.name}")
+        if rel not in self._maps:
+            if self.resources()[rel].size == 0:
+                return None
+            with open(self.skill_dir / rel, "rb") as f:
+                self._maps[rel] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._maps[rel]
+
+    def read(self, rel: str, offset: int = 0, length: int | None = None) -> bytes:
+        """Return ``length`` bytes of resource ``rel`` starting at ``offset``."""
+        m = self._map(rel)
+        if m is None:
+            return b""
+        end = len(m) if length is None else min(len(m), offset + length)
+        return m[offset:end]
+
+    def read_text(self, rel: str, offset: int = 0, length: int | None = None) -> str:
+        """Like :meth:`read`, decoded as UTF-8 (split characters are replaced)."""
+        return self.read(rel, offset, length).decode("utf-8", errors="replace")
+
+    def close(self) -> None:
+        for m in self._maps.values():
+            m.close()
+        self._maps.clear()
+
+
+def profile_skill(skill_dir: Path) -> dict:
+    """Report bytes and estimated tokens, always-loaded versus on demand.
+
+    Only stats resources; nothing beyond SKILL.md's size is read.
+    """
+    always = (skill_dir / SKILL_FILE).stat().st_size
+    on_demand = 0
+    files = 0
+    for top in RESOURCE_DIRS:
+        for dirpath, dirnames, filenames in os.walk(skill_dir / top):
+            dirnames[:] = [d for d in dirnames if d != "__pycache__"]
+            for name in filenames:
+                on_demand += os.path.getsize(os.path.join(dirpath, name))
+                files += 1
+    return {
+        "skill": skill_dir.name,
+        "always_bytes": always,
+        "always_tokens": estimate_tokens(always),
+        "on_demand_bytes": on_demand,
+        "on_demand_tokens": estimate_tokens(on_demand),
+        "on_demand_files": files,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_profile = sub.add_parser("profile", help="report each skill's byte and token footprint")
+    p_profile.add_argument("root", nargs="?", type=Path, default=Path(".claude/skills"))
+    p_profile.add_argument("--json", action="store_true", help="print NDJSON")
+
+    p_read = sub.add_parser("read", help="print a slice of a skill resource")
+    p_read.add_argument("skill_dir", type=Path)
+    p_read.add_argument("path", help="path relative to the skill, e.g. references/api.md")
+    p_read.add_argument("--offset", type=int, default=0)
+    p_read.add_argument("--length", type=int)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "read":
+        with SkillLoader(args.skill_dir) as loader:
+            try:
+                sys.stdout.buffer.write(loader.read(args.path, args.offset, args.length))
+            except KeyError as exc:
+                parser.error(exc.args[0])
+        return 0
+
+    rows = [profile_skill(d) for d in iter_skill_dirs(args.root)]
+    rows.sort(key=lambda r: r["always_tokens"] + r["on_demand_tokens"], reverse=True)
+    if args.json:
+        for row in rows:
+            print(json.dumps(row))
+        return 0
+    print(f"{'skill':<40} {'always':>10} {'~tokens':>9} {'on-demand':>11} {'~tokens':>9} {'files':>6}")
+    for r in rows:
+        print(
+            f"{r['skill']:<40} {r['always_bytes']:>10} {r['always_tokens']:>9} "
+            f"{r['on_demand_bytes']:>11} {r['on_demand_tokens']:>9} {r['on_demand_files']:>6}"
+        )
+    always = sum(r["always_tokens"] for r in rows)
+    on_demand = sum(r["on_demand_tokens"] for r in rows)
+    print(f"{len(rows)} skills: ~{always} tokens always loaded, ~{on_demand} tokens on demand")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""Incremental regeneration graph for spec-driven-development.
+
+Parses Markdown specs into addressable sections and records which generated
+files (and tests) came from which sections, with content hashes, in
+``.spec-graph.json``. ``status`` compares the current specs and outputs with
+the graph and reports the minimal set of dirty sections, the outputs to
+regenerate and the tests to run.
+
+A section is addressed as ``SPEC#ID``, where ID is a requirement ID in its
+heading (``REQ-12``, ``AUTH-3``) when it has one, otherwise the slugged path
+of its headings from the nearest ID'd ancestor (``auth/login-flow``,
+``REQ-12/errors``). ``record`` also accepts a bare ID when only one tracked
+spec defines it.
+A section's hash covers its own text only, so editing a subsection does not
+dirty its parent.
+
+Usage:
+    python scripts/spec_graph.py sections SPEC ...
+    python scripts/spec_graph.py record SECTION ... --spec SPEC --outputs FILE ... [--tests TEST ...]
+    python scripts/spec_graph.py status [--json]
+    python scripts/spec_graph.py graph
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+GRAPH_FILENAME = ".spec-graph.json"
+GRAPH_VERSION = 2
+
+HEADING_RE = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+FENCE_RE = re.compile(r"^\s*(```|~~~)")
+REQ_ID_RE = re.compile(r"\b([A-Z][A-Z0-9]*-\d+)\b")
+SLUG_RE = re.compile(r"[^a-z0-9]+")
+
+
+@dataclass
+class Section:
+    id: str
+    title: str
+    spec: str
+    line: int
+    sha256: str
+
+
+def slugify(text: str) -> str:
+    return SLUG_RE.sub("-", text.lower()).strip("-") or "section"
+
+
+def hash_text(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8", errors="surrogateescape")).hexdigest()
+
+
+def hash_file(path: str) -> str | None:
+    try:
+        with open(path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+def parse_sections(spec: str) -> list[Section]:
+    """Split a Markdown spec into sections keyed by requirement ID or heading path."""
+    with open(spec, encoding="utf-8") as f:
+        lines = f.read().splitlines()
+
+    sections: list[Section] = []
+    stack: list[tuple[int, str]] = []
+    seen: dict[str, int] = {}
+    current: tuple[str, str, int] | None = None
+    body: list[str] = []
+    in_fence = False
+
+    def close() -> None:
+        if current is not None:
+            sid, title, line = current
+            text = "\n".join(body).strip()
+            sections.append(Section(sid, title, spec, line, hash_text(title + "\n" + text)))
+
+    for lineno, line in enumerate(lines, 1):
+        if FENCE_RE.match(line):
+            in_fence = not in_fence
+        heading = None if in_fence else HEADING_RE.match(line)
+        if heading is None:
+            body.append(line)
+            continue
+        close()
+        level, title = len(heading.group(1)), heading.group(2)
+        while stack and stack[-1][0] >= level:
+            stack.pop()
+        req = REQ_ID_RE.search(title)
+        if req:
+            sid = req.group(1)
+        else:
+            sid = f"{stack[-1][1]}/{slugify(title)}" if stack else slugify(title)
+        if sid in seen:
+            seen[sid] += 1
+            sid = f"{sid}~{seen[sid]}"
+        else:
+            seen[sid] = 1
+        stack.append((level, sid))
+        current, body = (f"{spec}#{sid}", title, lineno), []
+    close()
+    return sections
+
+
+def load_graph(path: Path) -> dict:
+    try:
+        with open(path, encoding="utf-8") as f:
+            graph = json.load(f)
+    except FileNotFoundError:
+        return {"version": GRAPH_VERSION, "specs": [], "outputs": {}, "tests": {}}
+    if graph.get("version") != GRAPH_VERSION:
+        raise SystemExit(f"{path}: unsupported graph version {graph.get('version')}")
+    return graph
+
+
+def save_graph(graph: dict, path: Path) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(graph, f, indent=2, sort_keys=True)
+        f.write("\n")
+    os.replace(tmp, path)
+
+
+def resolve_section(sections: dict[str, Section], ref: str) -> str:
+    """Resolve ``ref`` to a full ``spec#id`` key.
+
+    A bare ID is accepted when exactly one tracked spec defines it.
+    """
+    if ref in sections:
+        return ref
+    if "#" not in ref:
+        matches = [key for key in sections if key.split("#", 1)[1] == ref]
+        if len(matches) == 1:
+            return matches[0]
+        if matches:
+            raise SystemExit(f"ambiguous section {ref!r}: use one of {', '.join(sorted(matches))}")
+    raise SystemExit(f"unknown section: {ref}")
+
+
+def current_sections(specs: list[str]) -> dict[str, Section]:
+    sections: dict[str, Section] = {}
+    for spec in specs:
+        if not os.path.exists(spec):
+            continue
+        for section in parse_sections(spec):
+            sections[section.id] = section
+    return sections
+
+
+def record(graph: dict, section_ids: list[str], outputs: list[str], tests: list[str], specs: list[str]) -> None:
+    """Record that ``outputs`` and ``tests`` were generated from ``section_ids``.
+
+    Each output's and test's dependencies are replaced, not merged, so
+    re-recording drops sections it no longer depends on.
+    """
+    graph["specs"] = sorted(set(graph["specs"]) | {os.path.normpath(spec) for spec in specs})
+    sections = current_sections(graph["specs"])
+    keys = [resolve_section(sections, ref) for ref in section_ids]
+    deps = {key: sections[key].sha256 for key in keys}
+    for output in map(os.path.normpath, outputs):
+        digest = hash_file(output)
+        if digest is None:
+            raise SystemExit(f"{output}: no such file")
+        graph["outputs"][output] = {"sha256": digest, "sections": deps}
+    for test in map(os.path.normpath, tests):
+        graph["tests"][test] = dict(deps)
+
+
+def status(graph: dict) -> dict:
+    """Compute what is dirty relative to the recorded graph."""
+    sections = current_sections(graph["specs"])
+    deps = [output["sections"] for output in graph["outputs"].values()]
+    deps += list(graph["tests"].values())
+
+    recorded: set[str] = set()
+    dirty_sections: set[str] = set()
+    for dep in deps:
+        for sid, digest in dep.items():
+            recorded.add(sid)
+            if sid not in sections or sections[sid].sha256 != digest:
+                dirty_sections.add(sid)
+
+    dirty_outputs = []
+    drifted_outputs = []
+    for path, output in sorted(graph["outputs"].items()):
+        if dirty_sections.intersection(output["sections"]):
+            dirty_outputs.append(path)
+        elif hash_file(path) != output["sha256"]:
+            drifted_outputs.append(path)
+
+    return {
+        "dirty_sections": sorted(dirty_sections),
+        "dirty_outputs": dirty_outputs,
+        "drifted_outputs": drifted_outputs,
+        "affected_tests": sorted(
+            test for test, dep in graph["tests"].items() if dirty_sections.intersection(dep)
+        ),
+        "unmapped_sections": sorted(sections.keys() - recorded),
+        "removed_sections": sorted(recorded - sections.keys()),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--graph", type=Path, default=Path(GRAPH_FILENAME))
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_sections = sub.add_parser("sections", help="list the sections of spec files")
+    p_sections.add_argument("specs", nargs="+")
+
+    p_record = sub.add_parser("record", help="record outputs generated from sections")
+    p_record.add_argument("sections", nargs="+")
+    p_record.add_argument("--outputs", nargs="+", default=[])
+    p_record.add_argument("--tests", nargs="*", default=[])
+    p_record.add_argument("--spec", dest="specs", action="append", default=[], help="spec file to track")
+
+    p_status = sub.add_parser("status", help="report dirty sections, outputs and tests")
+    p_status.add_argument("--json", action="store_true")
+
+    sub.add_parser("graph", help="print the dependency graph as JSON")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "sections":
+        for spec in args.specs:
+            for s in parse_sections(os.path.normpath(spec)):
+                print(f"{s.id}\t{s.spec}:{s.line}\t{s.title}")
+        return 0
+
+    graph = load_graph(args.graph)
+    if args.command == "record":
+        if not args.outputs and not args.tests:
+            parser.error("record needs --outputs and/or --tests")
+        record(graph, args.sections, args.outputs, args.tests, args.specs)
+        save_graph(graph, args.graph)
+    elif args.command == "status":
+        result = status(graph)
+        if args.json:
+            print(json.dumps(result, indent=2))
+        else:
+            for key, values in result.items():
+                for value in values:
+                    print(f"{key.replace('_', ' ')}: {value}")
+        return 1 if result["dirty_outputs"] or result["drifted_outputs"] else 0
+    else:
+        sections = current_sections(graph["specs"])
+        nodes = {
+            sid: {"spec": s.spec, "line": s.line, "title": s.title, "sha256": s.sha256}
+            for sid, s in sections.items()
+        }
+        print(json.dumps(dict(graph, sections=nodes), indent=2, sort_keys=True))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Exercise install_skills.py against temporary source and target trees.
+
+Usage:
+    python scripts/test_install_skills.py
+"""
+
+from __future__ import annotations
+
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from install_skills import MANIFEST_FILENAME, main, scan_source, sync_target
+
+
+def write(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+
+class SyncTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        root = Path(self.tmp.name)
+        self.source = root / "source"
+        self.target = root / "target"
+        self.target.mkdir()
+        write(self.source / "alpha" / "SKILL.md", "---\nname: alpha\n---\n")
+        write(self.source / "alpha" / "references" / "guide.md", "guide\n")
+        write(self.source / "beta" / "SKILL.md", "---\nname: beta\n---\n")
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def sync(self, **kwargs):
+        return sync_target(scan_source(self.source), self.target, mode="copy", **kwargs)
+
+    def test_first_sync_writes_every_file(self):
+        report = self.sync()
+        self.assertEqual((report.files_written, report.files_unchanged), (3, 0))
+        self.assertEqual((self.target / "alpha" / "references" / "guide.md").read_text(), "guide\n")
+        self.assertTrue((self.target / MANIFEST_FILENAME).is_file())
+
+    def test_second_sync_is_a_noop(self):
+        self.sync()
+        report = self.sync()
+        self.assertEqual((report.files_written, report.files_unchanged, report.bytes_written), (0, 3, 0))
+
+    def test_changed_file_is_rewritten(self):
+        self.sync()
+        write(self.source / "beta" / "SKILL.md", "---\nname: beta\ndescription: new\n---\n")
+        report = self.sync()
+        self.assertEqual((report.files_written, report.files_unchanged), (1, 2))
+
+    def test_removed_file_takes_its_empty_directory(self):
+        self.sync()
+        (self.source / "alpha" / "references" / "guide.md").unlink()
+        report = self.sync()
+        self.assertEqual(report.files_removed, 1)
+        self.assertFalse((self.target / "alpha" / "references").exists())
+        self.assertTrue((self.target / "alpha" / "SKILL.md").exists())
+
+    def test_removed_skill_is_pruned_and_unmanaged_skill_kept(self):
+        self.sync()
+        write(self.target / "local" / "SKILL.md", "---\nname: local\n---\n")
+        (self.source / "beta" / "SKILL.md").unlink()
+        report = self.sync()
+        self.assertEqual(report.skills_pruned, ["beta"])
+        self.assertFalse((self.target / "beta").exists())
+        self.assertTrue((self.target / "local" / "SKILL.md").exists())
+
+    def test_no_prune_keeps_removed_skill(self):
+        self.sync()
+        (self.source / "beta" / "SKILL.md").unlink()
+        report = self.sync(prune=False)
+        self.assertEqual(report.skills_pruned, [])
+        self.assertTrue((self.target / "beta" / "SKILL.md").exists())
+
+    def test_manifest_paths_outside_target_are_ignored(self):
+        outside = Path(self.tmp.name) / "outside"
+        write(outside / "keep.md", "keep\n")
+        self.sync()
+        manifest_path = self.target / MANIFEST_FILENAME
+        manifest = json.loads(manifest_path.read_text())
+        manifest["skills"]["../outside"] = {"keep.md": {}}
+        manifest["skills"]["alpha"]["../../outside/keep.md"] = {}
+        manifest_path.write_text(json.dumps(manifest))
+        report = self.sync()
+        self.assertEqual((report.files_removed, report.skills_pruned), (0, []))
+        self.assertTrue((outside / "keep.md").exists())
+
+    def test_duplicate_targets_are_synced_once(self):
+        alias = Path(self.tmp.name) / "alias"
+        os.symlink(self.target, alias)
+        args = ["--source", str(self.source), "--mode", "copy", "--json", str(self.target), str(self.target), str(alias)]
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out), contextlib.redirect_stderr(io.StringIO()):
+            self.assertEqual(main(args), 0)
+        reports = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual([r["target"] for r in reports], [str(self.target)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""Exercise roast_chunks.py against its local stub model server.
+
+Usage:
+    python scripts/test_roast_chunks.py
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from roast_chunks import JsonCache, RetryPolicy, make_stub_server, parse_diff, review_diff, split_hunk
+
+DIFF = """\
+diff --git a/x.py b/x.py
+--- a/x.py
++++ b/x.py
+@@ -1,3 +1,3 @@
+ import os
+-x = 1
++x = 1  # TODO tidy
+ y = 2
+diff --git a/gone.py b/gone.py
+deleted file mode 100644
+--- a/gone.py
++++ /dev/null
+@@ -1,2 +0,0 @@
+-a = 1
+-b = 2
+"""
+
+DUPLICATE_HUNKS = """\
+diff --git a/x.py b/x.py
+--- a/x.py
++++ b/x.py
+@@ -1,2 +1,3 @@
+ a = 1
++# TODO
+ b = 2
+@@ -50,2 +51,3 @@
+ a = 1
++# TODO
+ b = 2
+"""
+
+NO_NEWLINE = """\
+diff --git a/y.py b/y.py
+--- a/y.py
++++ b/y.py
+@@ -1 +1,2 @@
+-a
+\\ No newline at end of file
++a
++b  # TODO
+"""
+
+
+def big_diff(files: int = 20, lines: int = 200) -> str:
+    parts = []
+    for i in range(files):
+        body = "\n".join(f"+v{n} = {n}  # TODO {i}" for n in range(lines))
+        parts.append(
+            f"diff --git a/f{i}.py b/f{i}.py\n--- /dev/null\n+++ b/f{i}.py\n@@ -0,0 +1,{lines} @@\n{body}\n"
+        )
+    return "".join(parts)
+
+
+class StubServerTest(unittest.TestCase):
+    fail_rate = 0.0
+
+    def setUp(self) -> None:
+        random.seed(0)
+        self.server = make_stub_server(port=0, fail_rate=self.fail_rate)
+        self.endpoint = f"http://127.0.0.1:{self.server.server_port}/"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = JsonCache(Path(self.tmp.name))
+
+    def tearDown(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+        self.tmp.cleanup()
+
+    def serve_body(self, body: dict) -> str:
+        """Start a server answering every request with ``body``; return its URL."""
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self) -> None:
+                self.rfile.read(int(self.headers["Content-Length"]))
+                data = json.dumps(body).encode()
+                self.send_response(200)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format: str, *args) -> None:
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return f"http://127.0.0.1:{server.server_port}/"
+
+    def review(self, diff: str, **kwargs):
+        kwargs.setdefault("policy", RetryPolicy(attempts=20, base_delay=0.001, max_delay=0.01))
+        endpoint = kwargs.pop("endpoint", self.endpoint)
+        return asyncio.run(review_diff(diff, endpoint, cache=self.cache, **kwargs))
+
+
+class ReviewTest(StubServerTest):
+    def test_findings_carry_absolute_lines(self):
+        findings, stats = self.review(DIFF)
+        self.assertEqual(stats.failed_chunks, 0)
+        self.assertEqual([(f["file"], f["line"]) for f in findings], [("x.py", 2)])
+
+    def test_deleted_file_named_by_old_path(self):
+        self.assertEqual([h.file for h in parse_diff(DIFF)], ["x.py", "gone.py"])
+
+    def test_rerun_is_served_from_cache(self):
+        first, stats = self.review(big_diff(), max_chunk_bytes=8000)
+        self.assertGreater(stats.requests, 0)
+        second, stats = self.review(big_diff(), max_chunk_bytes=8000)
+        self.assertEqual(stats.requests, 0)
+        self.assertEqual(stats.cached, stats.hunks)
+        self.assertEqual(second, first)
+
+    def test_moved_hunk_reuses_cache_with_new_lines(self):
+        self.review(DIFF)
+        moved = DIFF.replace("@@ -1,3 +1,3 @@", "@@ -11,3 +11,3 @@")
+        findings, stats = self.review(moved)
+        self.assertEqual(stats.requests, 0)
+        self.assertEqual(findings[0]["line"], 12)
+
+    def test_oversized_hunks_are_split(self):
+        findings, stats = self.review(big_diff(files=1, lines=400), max_chunk_bytes=2000)
+        self.assertGreater(stats.hunks, 1)
+        self.assertEqual(stats.chunks, stats.hunks)
+        self.assertEqual(sorted(f["line"] for f in findings), list(range(1, 401)))
+
+    def test_split_keeps_line_numbers_after_no_newline_marker(self):
+        [hunk] = parse_diff(NO_NEWLINE)
+        self.assertEqual([p.start for p in split_hunk(hunk, 20)], [1, 1, 1, 2])
+        findings, _ = self.review(NO_NEWLINE, max_chunk_bytes=20)
+        self.assertEqual([f["line"] for f in findings], [2])
+
+    def test_identical_hunks_are_reviewed_once(self):
+        findings, stats = self.review(DUPLICATE_HUNKS)
+        self.assertEqual(stats.requests, 1)
+        self.assertEqual(sorted(f["line"] for f in findings), [2, 52])
+
+    def test_malformed_response_is_not_cached(self):
+        for body in ({"error": "overloaded"}, {"findings": [{"hunk": "other", "line": 0}]}):
+            findings, stats = self.review(DIFF, endpoint=self.serve_body(body))
+            self.assertEqual((findings, stats.failed_chunks), ([], 1))
+        findings, stats = self.review(DIFF)
+        self.assertEqual(stats.cached, 0)
+        self.assertEqual(len(findings), 1)
+
+
+class RetryTest(StubServerTest):
+    fail_rate = 0.5
+
+    def test_503s_are_retried(self):
+        findings, stats = self.review(big_diff(), max_chunk_bytes=4000)
+        self.assertGreater(stats.retries, 0)
+        self.assertEqual(stats.failed_chunks, 0)
+        self.assertEqual(len(findings), 20 * 200)
+
+
+if __name__ == "__main__":
+    unittest.main()
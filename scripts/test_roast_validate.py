@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""Exercise roast_validate.py against the roast_chunks.py stub model server.
+
+Usage:
+    python scripts/test_roast_validate.py
+"""
+
+from __future__ import annotations
+
+import asyncio
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from roast_chunks import JsonCache, RetryPolicy, make_stub_server
+from roast_validate import cluster_findings, validate_findings
+
+
+def finding(file: str, line: int, snippet: str | None, severity: str = "minor", **extra) -> dict:
+    return {
+        "file": file,
+        "line": line,
+        "severity": severity,
+        "rule": "leftover-marker",
+        "message": "leftover marker",
+        "snippet": snippet,
+        **extra,
+    }
+
+
+DUPLICATES = [
+    finding("a.py", 3, 'x = 1  # TODO "tidy"'),
+    finding("b.py", 40, 'x = 22  # TODO "later"'),
+    finding("c.py", 7, "x  =  5  # TODO 'x'"),
+]
+
+
+class ValidateTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.server = make_stub_server(port=0)
+        self.endpoint = f"http://127.0.0.1:{self.server.server_port}/"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = JsonCache(Path(self.tmp.name))
+
+    def tearDown(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+        self.tmp.cleanup()
+
+    def validate(self, findings: list[dict], **kwargs):
+        kwargs.setdefault("policy", RetryPolicy(attempts=2, base_delay=0.001, max_delay=0.01))
+        return asyncio.run(validate_findings(findings, self.endpoint, cache=self.cache, **kwargs))
+
+    def test_verdict_fans_out_to_cluster(self):
+        results, metrics = self.validate(DUPLICATES + [finding("d.py", 1, "y = 2  # FIXME", severity="nit")])
+        self.assertEqual((metrics.clusters, metrics.validated, metrics.requests), (2, 2, 1))
+        self.assertEqual([(r["file"], r["cluster_size"], r["valid"]) for r in results], [
+            ("a.py", 3, True),
+            ("b.py", 3, True),
+            ("c.py", 3, True),
+            ("d.py", 1, False),
+        ])
+        self.assertEqual(len({r["cluster"] for r in results[:3]}), 1)
+
+    def test_verdicts_are_cached(self):
+        first, _ = self.validate(DUPLICATES)
+        second, metrics = self.validate(DUPLICATES)
+        self.assertEqual((metrics.requests, metrics.cached), (0, 1))
+        self.assertEqual(second, first)
+
+    def test_batches_hold_several_clusters(self):
+        findings = [finding(f"f{i}.py", i, f"call_{'x' * i}()") for i in range(1, 6)]
+        _, metrics = self.validate(findings, batch_size=2)
+        self.assertEqual((metrics.clusters, metrics.requests, metrics.naive_requests), (5, 3, 5))
+
+    def test_snippetless_findings_are_not_merged(self):
+        findings = [
+            finding("a.py", 3, None),
+            finding("b.py", 90, ""),
+            finding("b.py", 91, None, message=None),
+            finding("b.py", 91, None, rule=None, message=None),
+        ]
+        self.assertEqual(len(cluster_findings(findings)), 4)
+        results, metrics = self.validate(findings)
+        self.assertEqual(metrics.clusters, 4)
+        self.assertTrue(all(r["cluster_size"] == 1 and r["valid"] for r in results))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""Validate skill directories against the repository's skill rules.
+
+Each skill directory must contain a ``SKILL.md`` whose frontmatter has a
+``name`` matching the directory name and a ``description`` that tells the
+agent when to use the skill. Results are streamed as NDJSON, one object per
+skill, while validation runs across a process pool.
+
+Usage:
+    python scripts/validate_skills.py [ROOT] [--jobs N] [--changed-since REV]
+
+Exits non-zero if any skill has an error.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from skill_index import SKILL_FILE, parse_frontmatter
+
+NAME_RE = re.compile(r"^[a-z0-9]+(-[a-z0-9]+)*$")
+NAME_MAX = 64
+DESCRIPTION_MAX = 1024
+DESCRIPTION_MIN_WORDS = 5
+TRIGGER_RE = re.compile(r"\b(use|when|triggers?)\b", re.IGNORECASE)
+
+# Below this many skills a process pool costs more than it saves.
+POOL_THRESHOLD = 64
+
+
+def validate_skill(skill_dir: str) -> dict:
+    """Validate one skill directory and return its result record."""
+    dirname = os.path.basename(skill_dir)
+    errors: list[str] = []
+    warnings: list[str] = []
+    try:
+        with open(os.path.join(skill_dir, SKILL_FILE), encoding="utf-8") as f:
+            meta = parse_frontmatter(f.read())
+    except FileNotFoundError:
+        return {"skill": dirname, "ok": False, "errors": [f"missing {SKILL_FILE}"], "warnings": []}
+    except UnicodeDecodeError:
+        return {"skill": dirname, "ok": False, "errors": [f"{SKILL_FILE} is not UTF-8"], "warnings": []}
+    except OSError as exc:
+        return {"skill": dirname, "ok": False, "errors": [f"cannot read {SKILL_FILE}: {exc.strerror}"], "warnings": []}
+
+    if not meta:
+        errors.append("missing YAML frontmatter")
+    name = meta.get("name", "")
+    description = meta.get("description", "")
+
+    if not name:
+        errors.append("missing 'name'")
+    else:
+        if name != dirname:
+            errors.append(f"name '{name}' does not match directory '{dirname}'")
+        if not NAME_RE.match(name) or len(name) > NAME_MAX:
+            errors.append(f"name '{name}' must be lowercase letters, digits and hyphens (max {NAME_MAX})")
+
+    if not description:
+        errors.append("missing 'description'")
+    else:
+        if len(description) > DESCRIPTION_MAX:
+            errors.append(f"description longer than {DESCRIPTION_MAX} characters")
+        if len(description.split()) < DESCRIPTION_MIN_WORDS:
+            warnings.append("description is too short to carry trigger keywords")
+        elif not TRIGGER_RE.search(description):
+            warnings.append("description does not say when to use the skill")
+
+    return {"skill": dirname, "ok": not errors, "errors": errors, "warnings": warnings}
+
+
+def list_skill_dirs(root: Path) -> list[str]:
+    """Return every non-hidden subdirectory of ``root``, sorted by name."""
+    return sorted(
+        entry.path
+        for entry in os.scandir(root)
+        if entry.is_dir() and not entry.name.startswith(".")
+    )
+
+
+def changed_skill_dirs(root: Path, rev: str) -> list[str]:
+    """Return skill directories under ``root`` touched since ``rev``.
+
+    Includes committed, staged, unstaged and untracked changes.
+    """
+    commands = [
+        ["git", "-C", str(root), "diff", "--name-only", "--relative", rev, "--"],
+        ["git", "-C", str(root), "ls-files", "--others", "--exclude-standard"],
+    ]
+    names: set[str] = set()
+    for cmd in commands:
+        out = subprocess.run(cmd, check=True, capture_output=True, text=True).stdout
+        for line in out.splitlines():
+            head, sep, _ = line.partition("/")
+            if sep and not head.startswith("."):
+                names.add(head)
+    return sorted(str(root / name) for name in names if (root / name).is_dir())
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("root", nargs="?", type=Path, default=Path(".claude/skills"))
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--changed-since", metavar="REV", help="only validate skills changed since REV")
+    parser.add_argument("--quiet", "-q", action="store_true", help="only print skills with findings")
+    args = parser.parse_args(argv)
+
+    if not args.root.is_dir():
+        parser.error(f"{args.root} is not a directory")
+    if args.changed_since:
+        try:
+            skill_dirs = changed_skill_dirs(args.root, args.changed_since)
+        except subprocess.CalledProcessError as exc:
+            parser.error(f"git failed: {exc.stderr.strip()}")
+    else:
+        skill_dirs = list_skill_dirs(args.root)
+
+    if args.jobs > 1 and len(skill_dirs) >= POOL_THRESHOLD:
+        pool = ProcessPoolExecutor(max_workers=args.jobs)
+        chunksize = max(1, len(skill_dirs) // (args.jobs * 8))
+        results = pool.map(validate_skill, skill_dirs, chunksize=chunksize)
+    else:
+        pool = None
+        results = map(validate_skill, skill_dirs)
+
+    failed = 0
+    try:
+        for result in results:
+            failed += not result["ok"]
+            if args.quiet and result["ok"] and not result["warnings"]:
+                continue
+            sys.stdout.write(json.dumps(result) + "\n")
+            sys.stdout.flush()
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    print(f"{len(skill_dirs)} skills checked, {failed} failed", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())